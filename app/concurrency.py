@@ -0,0 +1,31 @@
+from functools import partial
+from typing import Any, Callable
+
+import anyio
+from anyio.lowlevel import RunVar
+
+from app.config import settings
+
+_limiter: RunVar[anyio.CapacityLimiter] = RunVar("app_work_limiter")
+
+
+def work_limiter() -> anyio.CapacityLimiter:
+    try:
+        return _limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(settings.WORK_THREADS)
+        _limiter.set(limiter)
+        return limiter
+
+
+async def run_work(func: Callable[..., Any], *args: Any) -> Any:
+    """Run CPU bound request work such as drawing, encoding or measuring.
+
+    It gets worker threads of its own, bounded by `WORK_THREADS`, apart
+    from the default threadpool of the database calls. Object storage
+    calls go through `AsyncMinioPath.run_sync` instead, so slow fetches
+    never hold a work thread.
+    """
+    return await anyio.to_thread.run_sync(
+        partial(func, *args), limiter=work_limiter()
+    )
@@ -11,10 +11,24 @@ class Settings(BaseSettings):
     MINIO_HTTP: str
     MINIO_ROOT_USER: str
     MINIO_ROOT_PASSWORD: str
+    MINIO_POOL_SIZE: int = 32
 
     AI_MODULE_HTTP: str
     AI_MODULE_POST_ENDPOINT: str
 
+    VOLUME_CACHE_DIR: str | None = None
+    VOLUME_CACHE_BYTES: int = 20 * 1024**3
+    RESULTS_CACHE_BYTES: int = 512 * 1024**2
+    RESULTS_PREFETCH: int = 2
+    RENDER_CACHE_BYTES: int = 256 * 1024**2
+    RENDER_CACHE_STORE: bool = False
+    IMAGE_PNG_LEVEL: int = 1
+    IMAGE_QUALITY: int = 90
+    COMPOSITE_PADDING: int = 16
+    COMPOSITE_SCALE: float = 1.0
+    MEASUREMENTS_CACHE_BYTES: int = 64 * 1024**2
+    WORK_THREADS: int = 8
+
     JWT_PUBLIC_KEY: str
     JWT_PRIVATE_KEY: str
     REFRESH_TOKEN_EXPIRES_IN: int
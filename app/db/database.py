@@ -3,7 +3,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
-from minio_path import MinioPath
+from minio_path import MinioConfig, MinioPath
 
 USER = settings.POSTGRES_USER
 PASS = settings.POSTGRES_PASSWORD
@@ -29,18 +29,17 @@ def get_db():
 MINIO_HTTP = settings.MINIO_HTTP
 MINIO_ACCESS_KEY = settings.MINIO_ROOT_USER
 MINIO_SECRET_KEY = settings.MINIO_ROOT_PASSWORD
+MINIO_CONFIG = MinioConfig(
+    host=MINIO_HTTP,
+    access_key=MINIO_ACCESS_KEY,
+    secret_key=MINIO_SECRET_KEY,
+    secure=False,
+    pool_size=settings.MINIO_POOL_SIZE,
+)
 
 
 def get_minio_db():
-    s3_path = (
-        MinioPath.fromauth(
-            host=MINIO_HTTP,
-            access_key=MINIO_ACCESS_KEY,
-            secret_key=MINIO_SECRET_KEY,
-            secure=False,
-        )
-        / "inputdicom"
-    )
+    s3_path = MinioPath.fromconfig(MINIO_CONFIG) / "inputdicom"
     try:
         yield s3_path
     finally:
@@ -48,15 +47,7 @@ def get_minio_db():
 
 
 def get_minio_results():
-    s3_path = (
-        MinioPath.fromauth(
-            host=MINIO_HTTP,
-            access_key=MINIO_ACCESS_KEY,
-            secret_key=MINIO_SECRET_KEY,
-            secure=False,
-        )
-        / "testresults"
-    )
+    s3_path = MinioPath.fromconfig(MINIO_CONFIG) / "testresults"
     try:
         yield s3_path
     finally:
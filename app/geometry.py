@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from app.render import to_uint8
+from minio_path import MinioPath
+from minio_path.utils import numpy_load, pickle_dump
+
+GEOMETRY = "geometry.pkl"
+GEOMETRY_SOURCES = ("rotated_slice.npy", "rotated_mask.npy")
+
+
+def slice_geometry(rot_slice: np.ndarray, mask: np.ndarray) -> dict[str, Any]:
+    """Crop rows, mask contours and bounding box of a rotated slice.
+
+    `crop_rows` spans the rows that are not black once `rot_slice` is
+    rendered, the last one excluded as in the rendered crop. Contours
+    are found inside that crop and stored as int16 `(x, y)` polylines in
+    slice coordinates, the bounding box is `(x, y, width, height)` of the
+    whole mask.
+    """
+    nonzero_rows = np.flatnonzero(to_uint8(rot_slice).any(axis=1))
+    if len(nonzero_rows):
+        first, last = int(nonzero_rows[0]), int(nonzero_rows[-1])
+    else:
+        first, last = 0, 0
+    mask = np.asarray(mask).astype(np.uint8)
+    contours, _ = cv2.findContours(
+        np.ascontiguousarray(mask[first:last]),
+        cv2.RETR_CCOMP,
+        cv2.CHAIN_APPROX_NONE,
+        offset=(0, first),
+    )
+    return {
+        "crop_rows": (first, last),
+        "bbox": tuple(int(value) for value in cv2.boundingRect(mask)),
+        "contours": [
+            contour.reshape(-1, 2).astype(np.int16) for contour in contours
+        ],
+    }
+
+
+def store_series_geometry(
+    root: MinioPath, file_hash: str, series_hash: str, workers: int = 8
+) -> int:
+    """Store the geometry of every slice of a series that lacks it.
+
+    Returns the number of slices processed.
+    """
+    slices = root.joinpath(file_hash, series_hash, "slices", "").scan()
+
+    def store(slice_path: MinioPath) -> None:
+        rot_slice, mask = (
+            numpy_load(slice_path / name) for name in GEOMETRY_SOURCES
+        )
+        pickle_dump(slice_path / GEOMETRY, slice_geometry(rot_slice, mask))
+
+    pending = [
+        slice_path
+        for slice_path in slices.iterdir()
+        if slice_path.is_dir()
+        and not (slice_path / GEOMETRY).exists()
+        and all((slice_path / name).exists() for name in GEOMETRY_SOURCES)
+    ]
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(store, pending))
+    logger.info(
+        "GEOMETRY FOR {count} SLICES OF SERIES {series_hash} IS STORED",
+        count=len(pending),
+        series_hash=series_hash,
+    )
+    return len(pending)
@@ -0,0 +1,167 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from math import pi
+
+import numpy as np
+from loguru import logger
+
+from app.concurrency import run_work
+from dicom_wrapper import DicomCube, DicomParser, compute_spacing
+from minio_path import AsyncMinioPath, MinioPath
+from minio_path.utils import numpy_load
+
+MASK = "rotated_mask.npy"
+
+SeriesMeasurements = namedtuple(
+    "SeriesMeasurements",
+    ["big_diameter", "small_diameter", "length_of_circle", "area_of_circle"],
+)
+
+
+def measure_masks(
+    masks: np.ndarray, spacing: tuple[float, ...] = (1.0, 1.0)
+) -> SeriesMeasurements:
+    """Aorta measurements of every mask of an `(n, h, w)` stack at once.
+
+    `spacing` starts with the row and column spacing in mm, as in
+    `compute_spacing`. Diameters are the axes of the ellipse with the
+    same second moments as the mask, the length of the circle counts
+    the pixel edges on the mask boundary scaled by pi / 4, which is
+    exact on average for round shapes. Empty masks measure zero.
+    """
+    masks = np.asarray(masks).astype(bool, copy=False)
+    if not masks.size:
+        return SeriesMeasurements(*np.zeros((4, len(masks))))
+    row_spacing, column_spacing = (float(value) for value in spacing[:2])
+    rows = np.arange(masks.shape[1], dtype=np.int64)
+    columns = np.arange(masks.shape[2], dtype=np.int64)
+
+    row_counts = masks.sum(axis=2, dtype=np.int64)
+    column_counts = masks.sum(axis=1, dtype=np.int64)
+    pixels = row_counts.sum(axis=1)
+    count = np.maximum(pixels, 1).astype(np.float64)
+    mean_row = row_counts @ rows / count
+    mean_column = column_counts @ columns / count
+    # Central moments in pixels plus the variance of a pixel's own extent.
+    var_row = (row_counts @ rows**2 / count - mean_row**2 + 1 / 12) * (
+        row_spacing**2
+    )
+    var_column = (
+        column_counts @ columns**2 / count - mean_column**2 + 1 / 12
+    ) * column_spacing**2
+    covariance = (
+        np.einsum("nhw,h,w->n", masks, rows, columns) / count
+        - mean_row * mean_column
+    ) * (row_spacing * column_spacing)
+    half_trace = (var_row + var_column) / 2
+    spread = np.hypot((var_row - var_column) / 2, covariance)
+    big_diameter = 4 * np.sqrt(half_trace + spread)
+    small_diameter = 4 * np.sqrt(np.maximum(half_trace - spread, 0))
+
+    vertical_edges = (
+        np.count_nonzero(masks[:, :, 1:] != masks[:, :, :-1], axis=(1, 2))
+        + column_counts[:, 0]
+        + column_counts[:, -1]
+    )
+    horizontal_edges = (
+        np.count_nonzero(masks[:, 1:] != masks[:, :-1], axis=(1, 2))
+        + row_counts[:, 0]
+        + row_counts[:, -1]
+    )
+    length_of_circle = (
+        pi
+        / 4
+        * (vertical_edges * row_spacing + horizontal_edges * column_spacing)
+    )
+    area_of_circle = pixels * row_spacing * column_spacing
+
+    empty = pixels == 0
+    big_diameter[empty] = 0
+    small_diameter[empty] = 0
+    return SeriesMeasurements(
+        big_diameter, small_diameter, length_of_circle, area_of_circle
+    )
+
+
+def load_series_masks(
+    root: MinioPath, file_hash: str, series_hash: str, workers: int = 8
+) -> np.ndarray:
+    """Masks of all slices of a series stacked in slice order.
+
+    Slices are found with a single listing and their masks read
+    concurrently, smaller masks are zero padded to the largest one.
+    """
+    slices = root.joinpath(file_hash, series_hash, "slices", "").scan()
+    numbered = {}
+    for slice_path in slices.iterdir():
+        # Directory paths end with "/", so their `name` is empty.
+        slice_name = str(slice_path).rstrip("/").rsplit("/", 1)[-1]
+        if slice_path.is_dir() and slice_name.isdigit():
+            numbered[int(slice_name)] = slice_path / MASK
+    paths = [numbered[slice_num] for slice_num in sorted(numbered)]
+    with ThreadPoolExecutor(workers) as executor:
+        masks = list(executor.map(numpy_load, paths))
+    if not masks:
+        return np.zeros((0, 0, 0), bool)
+    height = max(mask.shape[0] for mask in masks)
+    width = max(mask.shape[1] for mask in masks)
+    stack = np.zeros((len(masks), height, width), bool)
+    for layer, mask in zip(stack, masks):
+        layer[: mask.shape[0], : mask.shape[1]] = mask
+    return stack
+
+
+def series_spacing(
+    dicom_root: MinioPath, file_hash: str, series_hash: str
+) -> tuple[float, float] | None:
+    """Row and column spacing of a series from its first located slice.
+
+    Headers are read up to the first one with a location, which goes
+    through `compute_spacing` as a series of one slice. None when no
+    slice of the series has a location, storage and parse errors are
+    raised.
+    """
+    cube = DicomCube(DicomParser(dicom_root.joinpath(file_hash, "DICOMDIR")))
+    serieses = dict(cube.serieses_name)
+    if series_hash not in serieses:
+        raise LookupError(f"Series {series_hash} is not in study {file_hash}")
+    for slice_record in serieses[series_hash].slices:
+        header = slice_record.read_header()
+        if header is not None:
+            spacing = compute_spacing(np.array([header.spacing], np.float64))
+            return float(spacing[0]), float(spacing[1])
+    logger.warning(
+        "SPACING FOR SERIES {series_hash} IS NOT FOUND",
+        series_hash=series_hash,
+    )
+    return None
+
+
+async def measure_series(
+    results_root: MinioPath,
+    dicom_root: MinioPath,
+    file_hash: str,
+    series_hash: str,
+) -> tuple[SeriesMeasurements, bool]:
+    """Measurements of a series and whether its spacing was found.
+
+    Without a located slice the masks are measured at 1 mm spacing.
+    Fetches run under the limiter of `AsyncMinioPath`, only the measuring
+    itself takes a work thread.
+    """
+    masks = await AsyncMinioPath.run_sync(
+        load_series_masks, results_root, file_hash, series_hash
+    )
+    spacing = await AsyncMinioPath.run_sync(
+        series_spacing, dicom_root, file_hash, series_hash
+    )
+    found = spacing is not None
+    if not found:
+        spacing = compute_spacing(None)[:2]
+    measurements = await run_work(measure_masks, masks, spacing)
+    logger.info(
+        "MEASUREMENTS FOR {count} SLICES OF SERIES {series_hash} ARE COMPUTED",
+        count=len(masks),
+        series_hash=series_hash,
+    )
+    return measurements, found
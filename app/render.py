@@ -0,0 +1,143 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+Window = namedtuple("Window", ["center", "width"])
+ImageFormat = namedtuple("ImageFormat", ["extension", "media_type"])
+
+WINDOW_PRESETS = {
+    "mediastinum": Window(50, 350),
+    "lung": Window(-600, 1500),
+    "bone": Window(400, 1800),
+}
+
+
+IMAGE_FORMATS = {
+    "png": ImageFormat(".png", "image/png"),
+    "webp": ImageFormat(".webp", "image/webp"),
+    "jpeg": ImageFormat(".jpg", "image/jpeg"),
+}
+
+
+@lru_cache(maxsize=64)
+def window_lut(dtype: str, center: float, width: float) -> np.ndarray:
+    """uint8 value of every possible `dtype` value, indexed by its bits."""
+    dtype = np.dtype(dtype)
+    bits = np.dtype(f"u{dtype.itemsize}")
+    values = np.arange(2 ** (8 * dtype.itemsize), dtype=bits).view(dtype)
+    lut = np.empty(values.shape, np.uint8)
+    _scale(values, center - width / 2, width, lut)
+    lut.flags.writeable = False
+    return lut
+
+
+def _scale(
+    image: np.ndarray,
+    low: float | np.ndarray,
+    width: float | np.ndarray,
+    out: np.ndarray,
+) -> np.ndarray:
+    buffer = np.subtract(image, low, dtype=np.float32)
+    width = np.asarray(width, np.float32)
+    buffer *= np.divide(255, width, out=np.zeros_like(width), where=width > 0)
+    np.clip(buffer, 0, 255, out=buffer)
+    np.copyto(out, buffer, casting="unsafe")
+    return out
+
+
+def to_uint8(
+    image: np.ndarray,
+    window: Window | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Map `image` to uint8 through `window`, its min/max range without one.
+
+    Integer images up to 16 bits go through a cached lookup table in a
+    single `np.take`, other images use one float32 buffer. For a stack of
+    slices without a window each slice is scaled by its own range, so
+    thumbnails of a whole series are rendered in one call.
+    """
+    image = np.asarray(image)
+    if out is None:
+        out = np.empty(image.shape, np.uint8)
+    if window is None:
+        axes = tuple(range(max(image.ndim - 2, 0), image.ndim))
+        low = image.min(axis=axes, keepdims=True).astype(np.float32)
+        high = image.max(axis=axes, keepdims=True).astype(np.float32)
+        return _scale(image, low, high - low, out)
+    if image.dtype.kind in "iu" and image.dtype.itemsize <= 2:
+        lut = window_lut(image.dtype.str, window.center, window.width)
+        bits = np.dtype(f"u{image.dtype.itemsize}")
+        return np.take(lut, image.view(bits), out=out)
+    return _scale(image, window.center - window.width / 2, window.width, out)
+
+
+def encode(
+    image: np.ndarray,
+    image_format: str = "png",
+    png_level: int = 1,
+    quality: int = 90,
+) -> bytes:
+    """Encode a grayscale or RGB uint8 `image` in memory.
+
+    `png_level` is the zlib level of PNG images, `quality` applies to
+    WebP and JPEG.
+    """
+    params = {
+        "png": [cv2.IMWRITE_PNG_COMPRESSION, png_level],
+        "webp": [cv2.IMWRITE_WEBP_QUALITY, quality],
+        "jpeg": [cv2.IMWRITE_JPEG_QUALITY, quality],
+    }[image_format]
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    encoded, data = cv2.imencode(
+        IMAGE_FORMATS[image_format].extension, image, params
+    )
+    if not encoded:
+        raise ValueError(f"Failed to encode image as {image_format}")
+    return data.tobytes()
+
+
+def to_rgb(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    return image
+
+
+def composite(
+    images: Sequence[np.ndarray],
+    padding: int = 16,
+    scale: float = 1.0,
+    background: int = 255,
+) -> np.ndarray:
+    """Tile uint8 images left to right on one RGB canvas.
+
+    Images are scaled by `scale`, centered vertically and separated and
+    surrounded by `padding` pixels of `background`. Only the canvas is
+    allocated besides the scaled tiles, and no global state is touched,
+    so it is safe to call from any thread.
+    """
+    tiles = [
+        to_rgb(
+            image
+            if scale == 1
+            else cv2.resize(
+                image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+        )
+        for image in images
+    ]
+    height = max(tile.shape[0] for tile in tiles)
+    width = sum(tile.shape[1] for tile in tiles) + padding * (len(tiles) - 1)
+    canvas = np.full(
+        (height + 2 * padding, width + 2 * padding, 3), background, np.uint8
+    )
+    left = padding
+    for tile in tiles:
+        top = padding + (height - tile.shape[0]) // 2
+        canvas[top : top + tile.shape[0], left : left + tile.shape[1]] = tile
+        left += tile.shape[1] + padding
+    return canvas
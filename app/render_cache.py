@@ -0,0 +1,106 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import anyio
+from minio import S3Error
+
+from minio_path import AsyncMinioPath, MinioPath
+
+# Image URLs name a slice of an appointment, not the study it shows, so
+# browsers revalidate every view and get a 304 while the ETag matches.
+REVALIDATE = "private, no-cache"
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": f'"{etag}"', "Cache-Control": REVALIDATE}
+
+
+def not_modified(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or f'"{etag}"' in tags
+
+
+class RenderCache:
+    """Encoded images of finished series, keyed by what they show.
+
+    The ETag is a digest of the render key, so a client revalidating an
+    image gets its 304 without anything being loaded. Images live in a
+    byte-bounded LRU and, with `store`, also as objects under the slice
+    directory they were rendered from, which every worker shares. It is
+    used from the event loop: an image in memory is returned without a
+    worker thread, `render` awaits its own fetches and encoding.
+    """
+
+    version = 1
+
+    def __init__(self, max_bytes: int = 256 * 1024**2, store: bool = False):
+        self.max_bytes = max_bytes
+        self.store = store
+        self.nbytes = 0
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self._rendering: dict[str, anyio.Lock] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def etag(cls, *key) -> str:
+        return hashlib.blake2b(
+            repr((cls.version, key)).encode(), digest_size=16
+        ).hexdigest()
+
+    def cached(self, etag: str) -> bytes | None:
+        """Image for `etag` if it is in memory, without rendering it."""
+        with self._lock:
+            image = self._images.get(etag)
+            if image is not None:
+                self._images.move_to_end(etag)
+            return image
+
+    def _put(self, etag: str, image: bytes) -> None:
+        with self._lock:
+            if etag in self._images or len(image) > self.max_bytes:
+                return
+            self._images[etag] = image
+            self.nbytes += len(image)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    async def get(
+        self,
+        etag: str,
+        render: Callable[[], Awaitable[bytes]],
+        directory: MinioPath | None = None,
+    ) -> bytes:
+        """Image for `etag`, rendered at most once while it is cached."""
+        image = self.cached(etag)
+        if image is not None:
+            return image
+        etag_lock = self._rendering.setdefault(etag, anyio.Lock())
+        async with etag_lock:
+            image = self.cached(etag)
+            if image is None:
+                image = await self._load(etag, render, directory)
+                self._put(etag, image)
+        self._rendering.pop(etag, None)
+        return image
+
+    async def _load(
+        self,
+        etag: str,
+        render: Callable[[], Awaitable[bytes]],
+        directory: MinioPath | None,
+    ) -> bytes:
+        if not self.store or directory is None:
+            return await render()
+        path = AsyncMinioPath(directory / "renders" / etag)
+        try:
+            return await path.read_range()
+        except S3Error:
+            image = await render()
+            await path.write(io.BytesIO(image), len(image))
+            return image
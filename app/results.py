@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from minio import S3Error
+
+from dicom_wrapper import VolumeCache
+from minio_path import MinioPath
+from minio_path.utils import numpy_load, pickle_load
+
+SLICE_ARTIFACTS = ("slice.npy", "rotated_slice.npy", "rotated_mask.npy")
+
+
+class ResultsLoader:
+    """Slice artifacts under `<file_hash>/<series_hash>/slices/<n>/`.
+
+    The artifacts of a slice are fetched concurrently and kept in a
+    bounded LRU. After every request the same artifacts of the next and
+    previous `prefetch` slices are loaded in the background, since slices
+    are viewed in order. Prefetching skips slices that do not exist.
+
+    At most `prefetch_queue` prefetches wait or run at a time, a new one
+    cancels the oldest still waiting, so scrolling fast does not queue
+    up slices nobody will read. Artifacts of series that are still
+    processed are loaded with `cache=False`, they may be rewritten.
+
+    `optional` artifacts load as None when they do not exist, and a
+    cached series is remembered to lack them for `absent_seconds`, as
+    they are written for a whole series at a time.
+    """
+
+    absent_seconds = 300.0
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024**2,
+        prefetch: int = 2,
+        workers: int = 8,
+        prefetch_workers: int = 4,
+        prefetch_queue: int = 32,
+    ):
+        self.cache = VolumeCache(max_bytes)
+        self.prefetch = prefetch
+        self.prefetch_queue = prefetch_queue
+        self._executor = ThreadPoolExecutor(workers)
+        self._prefetch_executor = ThreadPoolExecutor(prefetch_workers)
+        self._prefetching: OrderedDict[str, Future] = OrderedDict()
+        self._absent: dict[tuple[str, str, str], float] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def slice_path(
+        root: MinioPath, file_hash: str, series_hash: str, slice_num: int
+    ) -> MinioPath:
+        return root.joinpath(
+            file_hash, series_hash, "slices", str(slice_num), ""
+        )
+
+    @staticmethod
+    def _read(path: MinioPath) -> Any:
+        if path.name.endswith(".pkl"):
+            return pickle_load(path)
+        array = numpy_load(path)
+        array.flags.writeable = False
+        return array
+
+    def _get(self, path: MinioPath) -> Any:
+        return self.cache.get(str(path), lambda: self._read(path))
+
+    @staticmethod
+    def _fetch_optional(
+        read: Callable[[MinioPath], Any], path: MinioPath
+    ) -> Any:
+        try:
+            return read(path)
+        except S3Error as error:
+            if error.code != "NoSuchKey":
+                raise
+            return None
+
+    def absent(self, file_hash: str, series_hash: str, name: str) -> bool:
+        """Whether artifact `name` was recently missing from the series."""
+        since = self._absent.get((file_hash, series_hash, name))
+        return since is not None and (
+            time.monotonic() - since < self.absent_seconds
+        )
+
+    def load(
+        self,
+        root: MinioPath,
+        file_hash: str,
+        series_hash: str,
+        slice_num: int,
+        names: tuple[str, ...] = SLICE_ARTIFACTS,
+        cache: bool = True,
+        optional: tuple[str, ...] = (),
+    ) -> list[Any]:
+        path = self.slice_path(root, file_hash, series_hash, slice_num)
+        read = self._get if cache else self._read
+        futures = [
+            self._executor.submit(self._fetch_optional, read, path / name)
+            if name in optional
+            else self._executor.submit(read, path / name)
+            for name in names
+        ]
+        arrays = [future.result() for future in futures]
+        if cache:
+            for name, array in zip(names, arrays):
+                if array is None and name in optional:
+                    key = (file_hash, series_hash, name)
+                    self._absent[key] = time.monotonic()
+            if self.prefetch:
+                present = tuple(
+                    name
+                    for name, array in zip(names, arrays)
+                    if array is not None or name not in optional
+                )
+                self._prefetch(
+                    root, file_hash, series_hash, slice_num, present
+                )
+        return arrays
+
+    def _prefetch(
+        self,
+        root: MinioPath,
+        file_hash: str,
+        series_hash: str,
+        slice_num: int,
+        names: tuple[str, ...],
+    ) -> None:
+        neighbors = [
+            neighbor
+            for offset in range(1, self.prefetch + 1)
+            for neighbor in (slice_num + offset, slice_num - offset)
+            if neighbor >= 0
+        ]
+        for neighbor in neighbors:
+            for name in names:
+                path = (
+                    self.slice_path(root, file_hash, series_hash, neighbor)
+                    / name
+                )
+                self._submit_prefetch(path)
+
+    def _submit_prefetch(self, path: MinioPath) -> None:
+        key = str(path)
+        with self._lock:
+            if key in self.cache or key in self._prefetching:
+                return
+            while len(self._prefetching) >= self.prefetch_queue:
+                _, oldest = self._prefetching.popitem(last=False)
+                oldest.cancel()
+            future = self._prefetch_executor.submit(self._prefetch_one, path)
+            self._prefetching[key] = future
+        future.add_done_callback(partial(self._prefetched, key))
+
+    def _prefetched(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._prefetching.get(key) is future:
+                del self._prefetching[key]
+
+    def _prefetch_one(self, path: MinioPath) -> None:
+        # Neighbors are fetched directly, a missing one past either end
+        # of the series costs a single failed GET and is not cached.
+        try:
+            self._get(path)
+        except S3Error as error:
+            if error.code != "NoSuchKey":
+                raise
@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
 from app.db import crud, schemas
-from app.db.database import get_db
+from app.db.database import get_db, get_minio_results
+from app.geometry import store_series_geometry
+from minio_path import MinioPath
 
 router = APIRouter()
 
 
 @router.put("/change_status", response_model=schemas.StatusChange)
 def change_status(
-    status_data: schemas.StatusChange, db: Session = Depends(get_db)
+    status_data: schemas.StatusChange,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    s3_path: MinioPath = Depends(get_minio_results),
 ):
     changed_data = crud.change_status(db, status_data)
+    if changed_data.status == "Done":
+        background_tasks.add_task(
+            store_series_geometry,
+            s3_path,
+            changed_data.file_hash,
+            changed_data.series_hash,
+        )
     return schemas.StatusChange(**changed_data.__dict__)
@@ -1,11 +1,10 @@
-import os
-import tempfile
+import io
 import zipfile
 from datetime import datetime
 from math import ceil
+from typing import Any, Callable, Hashable
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 import requests
 from fastapi import (
@@ -14,25 +13,59 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from loguru import logger
 from minio import Minio
-from PIL import Image
+from pydicom import dcmread
 from sqlalchemy.orm import Session
 
 from app import oauth2
+from app.concurrency import run_work
 from app.config import settings
 from app.db import crud, schemas
 from app.db.database import get_db, get_minio_db, get_minio_results
-from dicom_wrapper import DicomCube, DicomParser
-from minio_path.utils import numpy_load
+from app.geometry import GEOMETRY, slice_geometry
+from app.measure import measure_series
+from app.render import (
+    IMAGE_FORMATS,
+    WINDOW_PRESETS,
+    Window,
+    composite,
+    encode,
+    to_rgb,
+    to_uint8,
+)
+from app.render_cache import RenderCache, cache_headers, not_modified
+from app.results import ResultsLoader
+from dicom_wrapper import (
+    DicomCube,
+    DicomParser,
+    DiskVolumeCache,
+    VolumeCache,
+    fingerprint,
+)
+from minio_path import AsyncMinioPath, Manifest, MinioPath
+from minio_path.utils import unzip
 
 router = APIRouter()
 AI_MODULE_HTTP = settings.AI_MODULE_HTTP
 AI_MODULE_POST_ENDPOINT = settings.AI_MODULE_POST_ENDPOINT
+if settings.VOLUME_CACHE_DIR:
+    DicomCube.disk_cache = DiskVolumeCache(
+        settings.VOLUME_CACHE_DIR, settings.VOLUME_CACHE_BYTES
+    )
+results_loader = ResultsLoader(
+    settings.RESULTS_CACHE_BYTES, settings.RESULTS_PREFETCH
+)
+render_cache = RenderCache(
+    settings.RENDER_CACHE_BYTES, settings.RENDER_CACHE_STORE
+)
+measurements_cache = VolumeCache(settings.MEASUREMENTS_CACHE_BYTES)
 
 
 @router.get("/me", response_model=schemas.ResponseUser)
@@ -268,8 +301,7 @@ def update_appointment(
     return appointment_updated
 
 
-def create_ai_request(cube, s3_path, file_hash):
-    cube.upload(s3_path)
+def create_ai_request(file_hash):
     ai_module_request = {
         "s3_dicom_path": file_hash,
         "slice_num": 10,
@@ -289,12 +321,37 @@ def create_ai_request(cube, s3_path, file_hash):
         )
 
 
+def store_dicom(
+    s3_path: MinioPath, dicom_unzip: zipfile.ZipFile, dicomdir_name: str
+) -> tuple[DicomCube, list[str]]:
+    # The study is stored under its fingerprint, members are laid out
+    # relative to the DICOMDIR as `DicomCube.upload` would store them.
+    dicomdir_data = dicom_unzip.read(dicomdir_name)
+    file_hash = fingerprint(
+        dcmread(io.BytesIO(dicomdir_data), force=True), dicomdir_data
+    )
+    study_path = s3_path.joinpath(file_hash, "")
+    manifest = Manifest.load(study_path)
+    prefix = dicomdir_name[: -len("DICOMDIR")]
+    for member_path in unzip(study_path, dicom_unzip, manifest, prefix):
+        if member_path.name == "DICOMDIR":
+            dicom_path = member_path
+
+    cube = DicomCube(DicomParser(dicom_path))
+    serieses_hashes = [
+        series_hash
+        for series_hash, series in cube.serieses_name
+        if len(series.headers) != 0
+    ]
+    return cube, serieses_hashes
+
+
 @router.put(
     "/add_file",
     response_model=schemas.ResponseSeriesesStatuses,
     description="Add file to existing appointment.",
 )
-def add_file(
+async def add_file(
     appointment_id: int,
     file: UploadFile,
     background_tasks: BackgroundTasks,
@@ -306,7 +363,9 @@ def add_file(
         "FILE FOR APPOINTMENT {appointment_id} IS GET",
         appointment_id=appointment_id,
     )
-    appointment = crud.get_appointment_by_id(db, appointment_id)
+    appointment = await run_in_threadpool(
+        crud.get_appointment_by_id, db, appointment_id
+    )
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -319,21 +378,25 @@ def add_file(
             detail="Only zip files are supported",
         )
     dicom_unzip = zipfile.ZipFile(file.file)
-
-    for filename in dicom_unzip.namelist():
-        (s3_path / filename).write(
-            dicom_unzip.open(filename), len(dicom_unzip.open(filename).read())
+    dicomdir_names = [
+        filename
+        for filename in dicom_unzip.namelist()
+        if filename.split("/")[-1] == "DICOMDIR"
+    ]
+    if not dicomdir_names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="DICOMDIR not found in zip file",
         )
-        if "DICOMDIR" in filename:
-            dicom_path = s3_path.joinpath(*filename.split("/"))
-
-    cube = DicomCube(DicomParser(dicom_path))
+    cube, serieses_hashes = await AsyncMinioPath.run_sync(
+        store_dicom, s3_path, dicom_unzip, dicomdir_names[0]
+    )
     file_hash = cube.hash
     logger.info(
         "HASH FOR FILE FOR APPOINTMENT {appointment_id} IS CALCULATED",
         appointment_id=appointment_id,
     )
-    background_tasks.add_task(create_ai_request, cube, s3_path, file_hash)
+    background_tasks.add_task(create_ai_request, file_hash)
     logger.info(
         "BACKGROUND TASK FOR FILE FOR APPOINTMENT {appointment_id} IS SEND",
         appointment_id=appointment_id,
@@ -346,11 +409,8 @@ def add_file(
         "Pathline extraction",
         "Slicing",
     ]
-    serieses_hashes, serieses_statuses = [], []
-    for series_hash, series_data in cube.serieses:
-        if len(series_data) == 0:
-            continue
-        serieses_hashes.append(series_hash)
+    serieses_statuses = []
+    for series_hash in serieses_hashes:
         series_steps_statuses = []
         for step_name in possible_steps:
             step_status = schemas.StepStatus(
@@ -375,7 +435,7 @@ def add_file(
         file_hash=file_hash,
         series_hashes=serieses_hashes,
     )
-    crud.create_status(db, input_data)
+    await run_in_threadpool(crud.create_status, db, input_data)
     logger.info(
         "STATUS FOR FILE FOR APPOINTMENT {appointment_id} IS CREATED",
         appointment_id=appointment_id,
@@ -436,7 +496,9 @@ def get_status(
             series_steps_statuses.append(step_status)
         series_steps_statuses = schemas.SeriesStepsStatuses(
             series_hash=series_hash,
-            slices_num=0 if series_status != "Done" else 10,  # if not ready - 0 slices
+            slices_num=0
+            if series_status != "Done"
+            else 10,  # if not ready - 0 slices
             series_statuses=series_steps_statuses,
         )
         serieses_statuses.append(series_steps_statuses)
@@ -448,47 +510,138 @@ def get_status(
     return response
 
 
-def get_temp_dir():
-    dir = tempfile.TemporaryDirectory()
-    try:
-        yield dir.name
-    finally:
-        del dir
+async def image_response(
+    request: Request,
+    minio: MinioPath,
+    series,
+    slice_num: int,
+    kind: Hashable,
+    image_format: str,
+    load: Callable[[], Any],
+    draw: Callable[[Any], np.ndarray],
+) -> Response:
+    """Image of a slice drawn by `draw` from the artifacts `load` fetches.
+
+    Fetching runs under the limiter of `AsyncMinioPath` and only drawing
+    and encoding take a work thread. Cached images of finished series
+    are answered on the event loop.
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported image format {image_format}",
+        )
+    media_type = IMAGE_FORMATS[image_format].media_type
+
+    def draw_image(loaded: Any) -> bytes:
+        return encode(
+            draw(loaded),
+            image_format,
+            png_level=settings.IMAGE_PNG_LEVEL,
+            quality=settings.IMAGE_QUALITY,
+        )
+
+    async def render_image() -> bytes:
+        loaded = await AsyncMinioPath.run_sync(load)
+        return await run_work(draw_image, loaded)
+
+    if series.status != "Done":
+        content = await render_image()
+        return Response(
+            content,
+            media_type=media_type,
+            headers={"Cache-Control": "no-cache"},
+        )
+    etag = RenderCache.etag(
+        series.file_hash,
+        series.series_hash,
+        slice_num,
+        kind,
+        image_format,
+        settings.IMAGE_PNG_LEVEL,
+        settings.IMAGE_QUALITY,
+    )
+    headers = cache_headers(etag)
+    if not_modified(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    content = await render_cache.get(
+        etag,
+        render_image,
+        ResultsLoader.slice_path(
+            minio, series.file_hash, series.series_hash, slice_num
+        ),
+    )
+    return Response(content, media_type=media_type, headers=headers)
 
 
 @router.get(
     "/get_slice",
     description="Get #slice_num slice for report.",
 )
-def get_slice(
+async def get_slice(
     appointment_id: int,
     series_id: int,
     slice_num: int,
+    request: Request,
+    window: str
+    | None = Query(
+        default=None, description="Preset: " + ", ".join(WINDOW_PRESETS)
+    ),
+    center: float | None = None,
+    width: float | None = Query(default=None, gt=0),
+    image_format: str = Query(
+        default="png", alias="format", description="png, webp or jpeg"
+    ),
     db: Session = Depends(get_db),
     minio: Minio = Depends(get_minio_results),
-    temp_dir=Depends(get_temp_dir),
     user_id: str = Depends(oauth2.require_user),
 ):
-    statuses = crud.get_status(db, appointment_id)
+    statuses = await run_in_threadpool(crud.get_status, db, appointment_id)
     if len(statuses) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Appointment {appointment_id} hasn't attached file",
         )
+    if window is not None and window not in WINDOW_PRESETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown window preset {window}",
+        )
+    if (center is None) != (width is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="center and width have to be given together",
+        )
+    slice_window = WINDOW_PRESETS.get(window)
+    if center is not None:
+        slice_window = Window(center, width)
     series = statuses[series_id][1]
     file_hash = series.file_hash
     series_hash = series.series_hash
+    # Artifacts of a series still being processed may be rewritten.
+    cache = series.status == "Done"
 
-    path = minio / file_hash / series_hash / "slices" / str(slice_num)
-    slice = numpy_load(path / "slice.npy")
-    slice = (slice - slice.min()) / (slice.max() - slice.min())
-    slice = (slice * 255).astype(np.uint8)
-    gray_image = Image.fromarray(slice, "L")
-
-    temp_file_path = os.path.join(temp_dir, "temp_image.png")
-    gray_image.save(temp_file_path)
+    def load() -> list[np.ndarray]:
+        return results_loader.load(
+            minio, file_hash, series_hash, slice_num, ("slice.npy",), cache
+        )
 
-    return FileResponse(temp_file_path)
+    def draw(loaded: list[np.ndarray]) -> np.ndarray:
+        (slice,) = loaded
+        return to_uint8(slice, slice_window)
+
+    return await image_response(
+        request,
+        minio,
+        series,
+        slice_num,
+        ("slice", slice_window),
+        image_format,
+        load,
+        draw,
+    )
 
 
 @router.get(
@@ -496,16 +649,19 @@ def get_slice(
     description="Get #slice_num rotated slice with "
     "aorta mask on it for report.",
 )
-def get_rotated_slice_masked(
+async def get_rotated_slice_masked(
     appointment_id: int,
     series_id: int,
     slice_num: int,
+    request: Request,
+    image_format: str = Query(
+        default="png", alias="format", description="png, webp or jpeg"
+    ),
     db: Session = Depends(get_db),
     minio: Minio = Depends(get_minio_results),
-    temp_dir=Depends(get_temp_dir),
     user_id: str = Depends(oauth2.require_user),
 ):
-    statuses = crud.get_status(db, appointment_id)
+    statuses = await run_in_threadpool(crud.get_status, db, appointment_id)
     if len(statuses) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -514,42 +670,87 @@ def get_rotated_slice_masked(
     series = statuses[series_id][1]
     file_hash = series.file_hash
     series_hash = series.series_hash
-
-    path = minio / file_hash / series_hash / "slices" / str(slice_num)
-    orig_slice = numpy_load(path / "slice.npy")
-    orig_slice = (orig_slice - orig_slice.min()) / (
-        orig_slice.max() - orig_slice.min()
-    )
-    orig_slice = (orig_slice * 255).astype(np.uint8)
-
-    rot_slice = numpy_load(path / "rotated_slice.npy")
-    rot_slice = (rot_slice - rot_slice.min()) / (
-        rot_slice.max() - rot_slice.min()
+    cache = series.status == "Done"
+
+    def load() -> tuple:
+        # Geometry is stored once a series is Done. It is fetched along
+        # with the slices, the mask instead when it is known to be absent.
+        names = ("slice.npy", "rotated_slice.npy")
+        if not cache or results_loader.absent(
+            file_hash, series_hash, GEOMETRY
+        ):
+            orig_slice, rot_slice, mask = results_loader.load(
+                minio,
+                file_hash,
+                series_hash,
+                slice_num,
+                names + ("rotated_mask.npy",),
+                cache,
+            )
+            return orig_slice, rot_slice, None, mask
+        orig_slice, rot_slice, geometry = results_loader.load(
+            minio,
+            file_hash,
+            series_hash,
+            slice_num,
+            names + (GEOMETRY,),
+            cache,
+            optional=(GEOMETRY,),
+        )
+        mask = None
+        if geometry is None:
+            (mask,) = results_loader.load(
+                minio,
+                file_hash,
+                series_hash,
+                slice_num,
+                ("rotated_mask.npy",),
+                cache,
+            )
+        return orig_slice, rot_slice, geometry, mask
+
+    def draw(loaded: tuple) -> np.ndarray:
+        orig_slice, rot_slice, geometry, mask = loaded
+        if geometry is None:
+            geometry = slice_geometry(rot_slice, mask)
+        return render_rotated_slice_masked(orig_slice, rot_slice, geometry)
+
+    return await image_response(
+        request,
+        minio,
+        series,
+        slice_num,
+        (
+            "rotated_slice_masked",
+            settings.COMPOSITE_PADDING,
+            settings.COMPOSITE_SCALE,
+        ),
+        image_format,
+        load,
+        draw,
     )
-    rot_slice = (rot_slice * 255).astype(np.uint8)
-    first_nonzero_row = rot_slice.nonzero()[0][0]
-    last_nonzero_row = rot_slice.nonzero()[0][-1]
-    rot_slice = rot_slice[first_nonzero_row:last_nonzero_row, :]
-
-    mask = numpy_load(path / "rotated_mask.npy").astype(np.uint8) * 255
-    mask = mask[first_nonzero_row:last_nonzero_row, :]
 
-    contours, _ = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
-    rot_slice = cv2.cvtColor(rot_slice, cv2.COLOR_GRAY2RGB)
-    cv2.drawContours(rot_slice, contours, -1, (255, 255, 0), 1)
 
-    temp_file_path = os.path.join(temp_dir, "temp_image.png")
-
-    fig, ax = plt.subplots(1, 2, figsize=(12, 6))
-    ax = ax.ravel()
-    ax[0].imshow(orig_slice, "gray")
-    ax[0].axis("off")
-    ax[1].imshow(rot_slice)
-    ax[1].axis("off")
-    fig.tight_layout()
-    fig.savefig(temp_file_path)
+def render_rotated_slice_masked(
+    orig_slice: np.ndarray,
+    rot_slice: np.ndarray,
+    geometry: dict,
+) -> np.ndarray:
+    first, last = geometry["crop_rows"]
+    rot_slice = to_rgb(to_uint8(rot_slice)[first:last, :])
+    contours = [
+        contour.astype(np.int32).reshape(-1, 1, 2)
+        for contour in geometry["contours"]
+    ]
+    cv2.drawContours(
+        rot_slice, contours, -1, (255, 255, 0), 1, offset=(0, -first)
+    )
 
-    return FileResponse(temp_file_path)
+    return composite(
+        [to_uint8(orig_slice), rot_slice],
+        padding=settings.COMPOSITE_PADDING,
+        scale=settings.COMPOSITE_SCALE,
+    )
 
 
 @router.get(
@@ -558,27 +759,37 @@ def get_rotated_slice_masked(
     description="""Get main parameters of aorta for each slice of requested series:
 Two diameters, length of a circle, area of a circle.""",
 )
-def get_parameters(
+async def get_parameters(
     appointment_id: int,
     series_id: int,
+    db: Session = Depends(get_db),
+    minio: Minio = Depends(get_minio_results),
+    dicom_root: Minio = Depends(get_minio_db),
     user_id: str = Depends(oauth2.require_user),
 ):
-    total_slices_num = get_slices_num(
-        appointment_id=appointment_id,
-        series_id=series_id,
-        user_id=user_id
-    )["slices_num"]
-
-    series_parameters = []
-    for _ in range(total_slices_num):
-        slice_parameters = schemas.SliceParameters(
-            big_diameter=33,
-            small_diameter=25,
-            length_of_circle=50,
-            area_of_circle=60,
+    statuses = await run_in_threadpool(crud.get_status, db, appointment_id)
+    if len(statuses) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Appointment {appointment_id} hasn't attached file",
+        )
+    series = statuses[series_id][1]
+    key = (series.file_hash, series.series_hash)
+    measurements = None
+    if series.status == "Done":
+        measurements = measurements_cache.peek(key)
+    if measurements is None:
+        measurements, spacing_found = await measure_series(
+            minio, dicom_root, *key
         )
-        series_parameters.append(slice_parameters)
+        # Measurements at the fallback spacing are not kept.
+        if series.status == "Done" and spacing_found:
+            measurements_cache.put(key, measurements)
 
+    series_parameters = [
+        schemas.SliceParameters(**dict(zip(measurements._fields, values)))
+        for values in zip(*(column.tolist() for column in measurements))
+    ]
     response = schemas.ResponseSeriesParameters(
         series_parameters=series_parameters,
     )
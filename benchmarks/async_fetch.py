@@ -0,0 +1,100 @@
+"""Concurrent slice fetches, default threadpool against `AsyncMinioPath`.
+
+Stores `--slices` slice sized objects on a running S3 endpoint and
+fetches them all at every concurrency, once through the default
+threadpool that sync routes run on and once through `AsyncMinioPath`,
+which the image and measurement routes fetch their artifacts with.
+While the fetches run, a trivial call is sent to the default
+threadpool, as another endpoint would, and its latency is reported:
+
+    python -m benchmarks.async_fetch --host 127.0.0.1:9000 --latency 50
+"""
+
+import argparse
+import io
+import os
+import time
+
+import anyio
+
+from benchmarks import storage
+from minio_path import AsyncMinioPath, MinioPath
+
+PREFIX = "async_fetch"
+
+
+async def default_pool(path: MinioPath) -> bytes:
+    return await anyio.to_thread.run_sync(path.read_range)
+
+
+async def async_path(path: MinioPath) -> bytes:
+    return await AsyncMinioPath(path).read_range()
+
+
+async def fetch_all(
+    paths: list[MinioPath], fetch, concurrency: int
+) -> tuple[float, float]:
+    """Seconds to fetch every path and latency of a concurrent call."""
+    slots = anyio.Semaphore(concurrency)
+    probe = 0.0
+
+    async def fetch_one(path: MinioPath) -> None:
+        async with slots:
+            await fetch(path)
+
+    async def probe_default_pool() -> None:
+        nonlocal probe
+        await anyio.sleep(0.05)
+        start = time.perf_counter()
+        await anyio.to_thread.run_sync(int)
+        probe = time.perf_counter() - start
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tasks:
+        for path in paths:
+            tasks.start_soon(fetch_one, path)
+        tasks.start_soon(probe_default_pool)
+    return time.perf_counter() - start, probe
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    root = storage.bucket(args)
+    data = os.urandom(args.size)
+    paths = [
+        root.joinpath(PREFIX, f"{number:05d}.npy")
+        for number in range(args.slices)
+    ]
+    MinioPath.write_many((path, io.BytesIO(data), len(data)) for path in paths)
+    print(
+        f"{'fetch':>14} {'concurrency':>12} {'seconds':>8} "
+        f"{'fetches/s':>10} {'other call ms':>14}"
+    )
+    try:
+        for concurrency in args.concurrency:
+            for name, fetch in (
+                ("default pool", default_pool),
+                ("AsyncMinioPath", async_path),
+            ):
+                elapsed, probe = await fetch_all(paths, fetch, concurrency)
+                print(
+                    f"{name:>14} {concurrency:>12} {elapsed:>8.2f} "
+                    f"{len(paths) / elapsed:>10.1f} {1000 * probe:>14.1f}"
+                )
+    finally:
+        storage.remove_prefix(root, f"{PREFIX}/")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    storage.add_arguments(parser)
+    parser.add_argument("--slices", type=int, default=200)
+    parser.add_argument("--size", type=int, default=512 * 1024)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 16, 64]
+    )
+    args = parser.parse_args()
+    anyio.run(benchmark, args)
+
+
+if __name__ == "__main__":
+    main()
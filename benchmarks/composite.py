@@ -0,0 +1,114 @@
+"""Render time of the masked rotated slice, matplotlib against `composite`.
+
+Builds a synthetic `--size` slice, a rotated copy with black bands
+above and below and a round aorta mask, then renders the side by side
+image as the old matplotlib figure did and as the route does with
+`composite`, with the geometry computed per render and loaded already
+computed, reporting the median of `--repeat` runs:
+
+    python -m benchmarks.composite --size 512 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+import cv2
+import matplotlib
+import numpy as np
+
+from app.geometry import slice_geometry
+from app.render import composite, to_rgb, to_uint8
+from benchmarks.synthetic import ct_frame
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def render_matplotlib(
+    orig_slice: np.ndarray, rot_slice: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    orig_slice = to_uint8(orig_slice)
+    rot_slice = to_uint8(rot_slice)
+    first_nonzero_row = rot_slice.nonzero()[0][0]
+    last_nonzero_row = rot_slice.nonzero()[0][-1]
+    rot_slice = rot_slice[first_nonzero_row:last_nonzero_row, :]
+    mask = mask.astype(np.uint8) * 255
+    mask = mask[first_nonzero_row:last_nonzero_row, :]
+    contours, _ = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
+    rot_slice = cv2.cvtColor(rot_slice, cv2.COLOR_GRAY2RGB)
+    cv2.drawContours(rot_slice, contours, -1, (255, 255, 0), 1)
+    fig, ax = plt.subplots(1, 2, figsize=(12, 6))
+    ax = ax.ravel()
+    ax[0].imshow(orig_slice, "gray")
+    ax[0].axis("off")
+    ax[1].imshow(rot_slice)
+    ax[1].axis("off")
+    fig.tight_layout()
+    fig.canvas.draw()
+    image = np.array(fig.canvas.buffer_rgba())[..., :3]
+    plt.close(fig)
+    return image
+
+
+def render_composite(
+    orig_slice: np.ndarray, rot_slice: np.ndarray, geometry: dict
+) -> np.ndarray:
+    first, last = geometry["crop_rows"]
+    rot_slice = to_rgb(to_uint8(rot_slice)[first:last, :])
+    contours = [
+        contour.astype(np.int32).reshape(-1, 1, 2)
+        for contour in geometry["contours"]
+    ]
+    cv2.drawContours(
+        rot_slice, contours, -1, (255, 255, 0), 1, offset=(0, -first)
+    )
+    return composite([to_uint8(orig_slice), rot_slice])
+
+
+def median_ms(render: Callable[[], np.ndarray], repeat: int) -> float:
+    render()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    orig_slice = ct_frame(args.size, rng)
+    rot_slice = ct_frame(args.size, rng)
+    band = args.size // 8
+    rot_slice[:band] = rot_slice[-band:] = rot_slice.min()
+    rows, columns = np.ogrid[: args.size, : args.size]
+    mask = np.hypot(rows - args.size / 2, columns - args.size / 2) < (
+        args.size / 16
+    )
+    geometry = slice_geometry(rot_slice, mask)
+    renders = {
+        "matplotlib": lambda: render_matplotlib(orig_slice, rot_slice, mask),
+        "composite": lambda: render_composite(
+            orig_slice, rot_slice, slice_geometry(rot_slice, mask)
+        ),
+        "composite, stored geometry": lambda: render_composite(
+            orig_slice, rot_slice, geometry
+        ),
+    }
+    print(f"two {args.size}x{args.size} slices")
+    print(f"{'render':>26} {'ms':>8} {'output':>12}")
+    for name, render in renders.items():
+        elapsed = median_ms(render, args.repeat)
+        height, width, _ = render().shape
+        print(f"{name:>26} {elapsed:>8.2f} {f'{width}x{height}':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Decode time of synthetic series with `SeriesDecoder`.
+
+Writes RLE compressed CT series of every requested length as DICOMDIR
+file sets into a temporary directory, then builds each volume with the
+old one slice at a time decoding and with the process pool at every
+worker count. Each decoder is timed on its second decode, as in a
+server where the pool outlives a request:
+
+    python -m benchmarks.decode_series --slices 100 500 2000 --workers 1 4 8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import write_study
+from dicom_wrapper import DicomCube, DicomParser, SeriesDecoder, VolumeBuilder
+from dicom_wrapper.series import DicomSeries
+
+
+def decode(dicomdir: Path, decoder: SeriesDecoder) -> float:
+    DicomSeries.builder = VolumeBuilder(decoder)
+    cube = DicomCube(DicomParser(dicomdir))
+    ((_, series),) = cube.serieses_name
+    series.slice_headers
+    start = time.perf_counter()
+    volume, _ = series.volume
+    elapsed = time.perf_counter() - start
+    assert len(volume) == series.slices_num
+    return elapsed
+
+
+def warm_decode(dicomdir: Path, decoder: SeriesDecoder) -> float:
+    """Decode time once the pool has started and decoded the series."""
+    decode(dicomdir, decoder)
+    return decode(dicomdir, decoder)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--slices", type=int, nargs="+", default=[100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--size", type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"{'slices':>7} {'decoder':>18} {'seconds':>9} {'ms/slice':>9}")
+    with tempfile.TemporaryDirectory() as root:
+        for slices in args.slices:
+            dicomdir = write_study(
+                Path(root, str(slices)), [slices], args.size, compressed=True
+            )
+            decoders = {
+                "sequential": SeriesDecoder(1, 1, processes=False),
+                **{
+                    f"{workers} processes": SeriesDecoder(
+                        decode_workers=workers
+                    )
+                    for workers in args.workers
+                },
+            }
+            for name, decoder in decoders.items():
+                elapsed = warm_decode(dicomdir, decoder)
+                decoder.shutdown()
+                print(
+                    f"{slices:>7} {name:>18} {elapsed:>9.2f} "
+                    f"{1000 * elapsed / slices:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
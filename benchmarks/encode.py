@@ -0,0 +1,71 @@
+"""Encode latency and size of a rendered slice in every image format.
+
+Scales a synthetic `--size` CT frame to uint8 by its range, as
+`get_slice` does without a window, and encodes it with `encode` as PNG
+at `--png-level`, WebP and JPEG at `--quality`, and with the old PIL
+PNG path for reference, reporting the median of `--repeat` runs:
+
+    python -m benchmarks.encode --size 512 --repeat 50
+"""
+
+import argparse
+import io
+import statistics
+import time
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from app.render import encode, to_uint8
+from benchmarks.synthetic import ct_frame
+
+
+def pil_png(image: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(image, "L").save(buffer, format="png")
+    return buffer.getvalue()
+
+
+def median_ms(encode_image: Callable[[], bytes], repeat: int) -> float:
+    encode_image()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode_image()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--png-level", type=int, default=1)
+    parser.add_argument("--quality", type=int, default=90)
+    args = parser.parse_args()
+
+    frame = ct_frame(args.size, np.random.default_rng(0))
+    image = to_uint8(frame)
+    encoders = {
+        f"png {args.png_level}": lambda: encode(
+            image, "png", png_level=args.png_level
+        ),
+        f"webp {args.quality}": lambda: encode(
+            image, "webp", quality=args.quality
+        ),
+        f"jpeg {args.quality}": lambda: encode(
+            image, "jpeg", quality=args.quality
+        ),
+        "PIL png": lambda: pil_png(image),
+    }
+    print(f"{args.size}x{args.size} uint8 slice")
+    print(f"{'format':>9} {'ms':>8} {'KiB':>8}")
+    for name, encode_image in encoders.items():
+        elapsed = median_ms(encode_image, args.repeat)
+        size = len(encode_image()) / 1024
+        print(f"{name:>9} {elapsed:>8.2f} {size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
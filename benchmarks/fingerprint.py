@@ -0,0 +1,58 @@
+"""Study hash time and allocations, `str(dataset)` md5 against `fingerprint`.
+
+Writes a study whose DICOMDIR holds at least `--records` directory
+records, then hashes it the old way, rendering the whole dataset to a
+string, and with `fingerprint`, measuring time and peak allocations:
+
+    python -m benchmarks.fingerprint --records 10000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from pydicom import dcmread
+
+from benchmarks.synthetic import write_study
+from dicom_wrapper import fingerprint
+from dicom_wrapper.parser import make_hash
+
+
+def measure(hash_study: Callable[[], str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    hash_study()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    hash_study()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--series", type=int, default=100)
+    args = parser.parse_args()
+
+    slices = -(-args.records // args.series)
+    with tempfile.TemporaryDirectory() as root:
+        dicomdir = write_study(Path(root), [slices] * args.series, size=8)
+        data = dicomdir.read_bytes()
+        dicom = dcmread(dicomdir)
+        records = len(dicom.DirectoryRecordSequence)
+        print(f"{records} records, DICOMDIR of {len(data) / 1024**2:.1f} MiB")
+        print(f"{'hash':>12} {'seconds':>9} {'peak KiB':>9}")
+        for name, hash_study in (
+            ("str md5", lambda: make_hash(dicom)),
+            ("fingerprint", lambda: fingerprint(dicom, data)),
+        ):
+            elapsed, peak = measure(hash_study)
+            print(f"{name:>12} {elapsed:>9.3f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
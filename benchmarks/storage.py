@@ -0,0 +1,52 @@
+"""S3 endpoint options shared by the storage benchmarks."""
+
+import argparse
+import time
+
+from minio.deleteobjects import DeleteObject
+
+from minio_path import MinioPath
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1:9000")
+    parser.add_argument("--access-key", default="minioadmin")
+    parser.add_argument("--secret-key", default="minioadmin")
+    parser.add_argument("--bucket", default="benchmarks")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="milliseconds added to every request, to emulate a remote "
+        "endpoint with a local one",
+    )
+
+
+def bucket(args: argparse.Namespace) -> MinioPath:
+    """Path of the benchmark bucket, created when missing."""
+    root = MinioPath.fromauth(args.host, args.access_key, args.secret_key)
+    if not root.minio.bucket_exists(args.bucket):
+        root.minio.make_bucket(args.bucket)
+    if args.latency:
+        url_open = root.minio._url_open
+
+        def delayed_url_open(*request_args, **request_kwargs):
+            time.sleep(args.latency / 1000)
+            return url_open(*request_args, **request_kwargs)
+
+        root.minio._url_open = delayed_url_open
+    return root / args.bucket
+
+
+def remove_prefix(root: MinioPath, prefix: str) -> None:
+    errors = root.minio.remove_objects(
+        root.bucket,
+        (
+            DeleteObject(item.object_name)
+            for item in root.minio.list_objects(
+                root.bucket, prefix=prefix, recursive=True
+            )
+        ),
+    )
+    for error in errors:
+        raise RuntimeError(f"could not remove {error.name}: {error.message}")
@@ -0,0 +1,94 @@
+"""Synthetic CT studies written as DICOMDIR file sets."""
+
+from pathlib import Path
+
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.fileset import FileSet
+from pydicom.uid import (
+    CTImageStorage,
+    ExplicitVRLittleEndian,
+    RLELossless,
+    generate_uid,
+)
+
+
+class _NewInstancesFileSet(FileSet):
+    """File set that skips the duplicate check of `add`.
+
+    pydicom compares every added instance with all the staged ones,
+    which makes large synthetic studies quadratic to build, while the
+    instances written here always have fresh UIDs.
+    """
+
+    _adding = False
+
+    def __iter__(self):
+        if self._adding:
+            return iter(())
+        return super().__iter__()
+
+    def add(self, ds_or_path):
+        self._adding = True
+        try:
+            return super().add(ds_or_path)
+        finally:
+            self._adding = False
+
+
+def ct_frame(size: int, rng: np.random.Generator) -> np.ndarray:
+    """int16 frame of a smooth gradient with noise, compressing like CT."""
+    return (
+        np.add.outer(np.arange(size), np.arange(size)) % 1024
+        + rng.integers(-20, 20, (size, size))
+    ).astype(np.int16)
+
+
+def write_study(
+    directory: Path,
+    series_slices: list[int],
+    size: int = 512,
+    compressed: bool = False,
+) -> Path:
+    """Write one series per entry of `series_slices`, return the DICOMDIR.
+
+    Frames are a smooth gradient with noise, which compresses about as
+    well as real CT, and RLE compressed with `compressed`.
+    """
+    file_set = _NewInstancesFileSet()
+    study_uid = generate_uid()
+    rng = np.random.default_rng(0)
+    for series_number, slices in enumerate(series_slices, 1):
+        series_uid = generate_uid()
+        for number in range(slices):
+            dataset = Dataset()
+            dataset.file_meta = FileMetaDataset()
+            dataset.file_meta.MediaStorageSOPClassUID = CTImageStorage
+            dataset.file_meta.MediaStorageSOPInstanceUID = generate_uid()
+            dataset.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+            dataset.SOPClassUID = CTImageStorage
+            dataset.SOPInstanceUID = (
+                dataset.file_meta.MediaStorageSOPInstanceUID
+            )
+            dataset.PatientName, dataset.PatientID = "Bench^Patient", "B1"
+            dataset.StudyInstanceUID, dataset.StudyID = study_uid, "1"
+            dataset.StudyDate, dataset.StudyTime = "20240101", "101010"
+            dataset.SeriesInstanceUID = series_uid
+            dataset.SeriesNumber = series_number
+            dataset.Modality = "CT"
+            dataset.SeriesDescription = f"Bench{series_number}"
+            dataset.InstanceNumber = number + 1
+            dataset.PixelSpacing = [0.7, 0.7]
+            dataset.SliceLocation = float(slices - number) * 2.5
+            dataset.Rows = dataset.Columns = size
+            dataset.BitsAllocated = dataset.BitsStored = 16
+            dataset.HighBit, dataset.PixelRepresentation = 15, 1
+            dataset.SamplesPerPixel = 1
+            dataset.PhotometricInterpretation = "MONOCHROME2"
+            frame = ct_frame(size, rng)
+            dataset.PixelData = frame.tobytes()
+            if compressed:
+                dataset.compress(RLELossless)
+            file_set.add(dataset)
+    file_set.write(directory)
+    return directory / "DICOMDIR"
@@ -0,0 +1,114 @@
+"""Peak RSS and wall time of zip ingestion, old double read against `unzip`.
+
+Builds a synthetic deflated archive of `--total` MiB made of CT slice
+sized members plus one `--large` MiB member, then ingests it into a
+running S3 endpoint in a fresh process per path: the old one, which
+decompressed every member once to learn its length and again to upload
+it, and `unzip`, which streams each member once:
+
+    python -m benchmarks.unzip --host 127.0.0.1:9000 --total 2048
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import storage
+from minio_path.utils import unzip
+
+PREFIX = "unzip"
+MEMBER_BYTES = 512 * 1024
+
+
+def write_archive(path: Path, total: int, large: int) -> None:
+    rng = np.random.default_rng(0)
+    # Compresses about as well as CT pixel data.
+    member = (
+        np.arange(MEMBER_BYTES // 2) % 1024
+        + rng.integers(-20, 20, MEMBER_BYTES // 2)
+    ).astype(np.int16)
+    with zipfile.ZipFile(
+        path, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as z:
+        with z.open("study/LARGE", "w", force_zip64=True) as large_member:
+            for _ in range(large * 1024**2 // MEMBER_BYTES):
+                large_member.write(member.tobytes())
+        for number in range((total - large) * 1024**2 // MEMBER_BYTES):
+            z.writestr(f"study/DICOM/IM{number:06d}", member.tobytes())
+
+
+def ingest_old(root, archive: zipfile.ZipFile) -> None:
+    for filename in archive.namelist():
+        path = root.joinpath(*filename.split("/"))
+        root.minio.put_object(
+            path.bucket,
+            path.objectname,
+            archive.open(filename),
+            len(archive.open(filename).read()),
+        )
+
+
+def ingest_unzip(root, archive: zipfile.ZipFile) -> None:
+    for _ in unzip(root, archive):
+        pass
+
+
+def run(args: argparse.Namespace) -> None:
+    root = storage.bucket(args).joinpath(PREFIX, args.mode, "")
+    ingest = {"old": ingest_old, "unzip": ingest_unzip}[args.mode]
+    start = time.perf_counter()
+    with zipfile.ZipFile(args.archive) as archive:
+        ingest(root, archive)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    storage.remove_prefix(root, f"{PREFIX}/{args.mode}/")
+    print(json.dumps({"seconds": elapsed, "peak": peak}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    storage.add_arguments(parser)
+    parser.add_argument("--total", type=int, default=2048)
+    parser.add_argument("--large", type=int, default=256)
+    parser.add_argument("--mode", choices=["old", "unzip"])
+    parser.add_argument("--archive", type=Path)
+    args = parser.parse_args()
+    if args.mode:
+        run(args)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = Path(directory, "study.zip")
+        write_archive(archive, args.total, args.large)
+        print(
+            f"{args.total} MiB in {len(zipfile.ZipFile(archive).namelist())}"
+            f" members, archive of {archive.stat().st_size / 1024**2:.0f} MiB"
+        )
+        print(f"{'ingest':>8} {'seconds':>9} {'peak RSS MiB':>13}")
+        for mode in ("old", "unzip"):
+            result = json.loads(
+                subprocess.run(
+                    [sys.executable, "-m", "benchmarks.unzip"]
+                    + sys.argv[1:]
+                    + ["--mode", mode, "--archive", str(archive)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+            )
+            print(
+                f"{mode:>8} {result['seconds']:>9.2f} "
+                f"{result['peak'] / 1024**2:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
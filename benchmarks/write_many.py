@@ -0,0 +1,71 @@
+"""Study upload throughput, one `put_object` at a time against `write_many`.
+
+Uploads `--objects` objects of `--size` bytes, about one CT slice each,
+to a running S3 endpoint, first sequentially as uploads used to be and
+then through `MinioPath.write_many` at every worker count:
+
+    python -m benchmarks.write_many --host 127.0.0.1:9000 --workers 1 8 32
+"""
+
+import argparse
+import io
+import os
+import time
+from typing import Callable
+
+from benchmarks import storage
+from minio_path import MinioPath
+
+PREFIX = "write_many"
+
+
+def sequential(objects: list[tuple[MinioPath, bytes]]) -> None:
+    for path, data in objects:
+        path.write(io.BytesIO(data), len(data))
+
+
+def concurrent(workers: int) -> Callable:
+    def upload(objects: list[tuple[MinioPath, bytes]]) -> None:
+        MinioPath.write_many(
+            ((path, io.BytesIO(data), len(data)) for path, data in objects),
+            workers=workers,
+        )
+
+    return upload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    storage.add_arguments(parser)
+    parser.add_argument("--objects", type=int, default=500)
+    parser.add_argument("--size", type=int, default=512 * 1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    root = storage.bucket(args)
+    data = os.urandom(args.size)
+    uploads = {
+        "sequential": sequential,
+        **{
+            f"write_many x{workers}": concurrent(workers)
+            for workers in args.workers
+        },
+    }
+    print(f"{'upload':>16} {'seconds':>9} {'objects/s':>10} {'MiB/s':>8}")
+    for run, (name, upload) in enumerate(uploads.items()):
+        objects = [
+            (root.joinpath(PREFIX, str(run), f"{number:05d}"), data)
+            for number in range(args.objects)
+        ]
+        start = time.perf_counter()
+        upload(objects)
+        elapsed = time.perf_counter() - start
+        storage.remove_prefix(root, f"{PREFIX}/{run}/")
+        print(
+            f"{name:>16} {elapsed:>9.2f} {args.objects / elapsed:>10.1f} "
+            f"{args.objects * args.size / 1024**2 / elapsed:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
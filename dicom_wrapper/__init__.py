@@ -1,14 +1,25 @@
+from .cache import VolumeCache
 from .cube import DicomCube
+from .decode import SeriesDecoder
+from .disk_cache import DiskVolumeCache
+from .fingerprint import fingerprint
 from .parser import DicomParser
-from .series import Series
+from .series import Series, SeriesIndex
 from .spacing import Spacing, compute_spacing
 from .utils import dicom_find
+from .volume import VolumeBuilder
 
 __all__ = [
     "DicomCube",
     "DicomParser",
+    "DiskVolumeCache",
     "Series",
+    "SeriesDecoder",
+    "SeriesIndex",
     "Spacing",
+    "VolumeBuilder",
+    "VolumeCache",
     "compute_spacing",
     "dicom_find",
+    "fingerprint",
 ]
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .disk_cache import DiskVolumeCache
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, dict):
+        value = tuple(value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return getattr(value, "nbytes", 0)
+
+
+class VolumeCache:
+    """LRU of decoded volumes bounded by their total size in bytes.
+
+    Concurrent requests for the same key wait for a single load. With a
+    `disk` tier, misses are looked up there under `namespace` before
+    loading, and loaded volumes are stored there.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk: DiskVolumeCache | None = None,
+        namespace: str = "",
+    ):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.namespace = namespace
+        self.nbytes = 0
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        self._loading: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            if key not in self._values:
+                return False, None
+            self._values.move_to_end(key)
+            return True, self._values[key]
+
+    def peek(self, key: Hashable) -> Any:
+        """Cached value of `key`, None when it is not cached."""
+        return self._get(key)[1]
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        found, value = self._get(key)
+        if found:
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            found, value = self._get(key)
+            if not found:
+                value = self._load(key, load)
+                self.put(key, value)
+        with self._lock:
+            self._loading.pop(key, None)
+        return value
+
+    def _load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        if self.disk is None:
+            return load()
+        disk_key = f"{self.namespace}_{key}"
+        value = self.disk.get(disk_key)
+        if value is None:
+            value = load()
+            volume, spacing = value
+            if len(volume):
+                self.disk.put(disk_key, volume, spacing)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = _nbytes(value)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_bytes:
+                return
+            self._values[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                self._pop(next(iter(self._values)))
+
+    def _pop(self, key: Hashable) -> None:
+        if key in self._values:
+            self.nbytes -= _nbytes(self._values.pop(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self.nbytes = 0
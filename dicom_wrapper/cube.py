@@ -1,30 +1,43 @@
 import io
+from functools import cached_property
 from typing import Generator
 
-from minio_path import MinioPath
-from minio_path.utils import read_file, recursive_read_files
+from minio_path import Manifest, MinioPath
+from minio_path.utils import recursive_read_files
 
+from .cache import VolumeCache
+from .disk_cache import DiskVolumeCache
+from .fingerprint import fingerprint
 from .parser import DicomParser, make_hash
 from .patient import DicomPatient
-from .series import DicomSeries, Series
+from .series import DicomSeries, Series, SeriesIndex
 
 
 class DicomCube:
-    def __init__(self, parser: DicomParser):
+    disk_cache: DiskVolumeCache | None = None
+
+    def __init__(self, parser: DicomParser, cache: VolumeCache | None = None):
         self.path = parser.path
         self.slice_path = parser.slice_path
-        self.dicom = parser.read()
-        self.patient_records = [
-            DicomPatient(record, self.path, self.slice_path)
-            for record in self.dicom.patient_records
-        ]
+        self.data = parser.read_bytes()
+        self.dicom = parser.read(self.data)
+        if cache is None:
+            cache = VolumeCache(disk=self.disk_cache, namespace=self.hash)
+        self.cache = cache
 
     def __str__(self) -> str:
         return str(self.path)
 
-    @property
+    @cached_property
+    def patient_records(self) -> list[DicomPatient]:
+        return [
+            DicomPatient(record, self.path, self.slice_path, self.cache)
+            for record in self.dicom.patient_records
+        ]
+
+    @cached_property
     def hash(self) -> str:
-        return make_hash(self.dicom)
+        return fingerprint(self.dicom, self.data)
 
     @property
     def old_hash_mapping(self) -> Generator[tuple[str, str], None, None]:
@@ -50,6 +63,12 @@ class DicomCube:
                 for series in patient.serieses
             )
 
+    @property
+    def series_index(self) -> Generator[SeriesIndex, None, None]:
+        """Series names, UIDs and slice counts, without building slices."""
+        for name, series in self.serieses_name:
+            yield SeriesIndex(name, series.uid, series.slices_num)
+
     @property
     def serieses_name(self) -> Generator[tuple[str, DicomSeries], None, None]:
         for patient in self.patient_records:
@@ -58,15 +77,29 @@ class DicomCube:
                 for name, series in patient.series_names
             )
 
-    def upload(self, s3path: MinioPath):
-        dicom = read_file(self.path)
-        data = dicom.read()
-        (s3path / self.hash / "DICOMDIR").write(io.BytesIO(data), len(data))
+    def _upload_objects(
+        self, s3path: MinioPath
+    ) -> Generator[tuple[MinioPath, io.BytesIO, int], None, None]:
+        yield (
+            s3path / self.hash / "DICOMDIR",
+            io.BytesIO(self.data),
+            len(self.data),
+        )
         for slice_file, slice_io_data in recursive_read_files(self.slice_path):
             slice_name = str(slice_file).replace(str(self.path.parent), "")
             slice_data = slice_io_data.read()
-            (s3path / self.hash / slice_name).write(
-                io.BytesIO(slice_data), len(slice_data)
+            yield (
+                s3path / self.hash / slice_name,
+                io.BytesIO(slice_data),
+                len(slice_data),
             )
 
+    def upload(self, s3path: MinioPath):
+        manifest = Manifest.load(s3path / self.hash)
+        MinioPath.write_many(
+            (path, data, length)
+            for path, data, length in self._upload_objects(s3path)
+            if manifest.update(path, Manifest.digest(data.getbuffer()))
+        )
+        manifest.save()
         return s3path / self.hash / "DICOMDIR"
@@ -0,0 +1,141 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Generator
+
+import numpy as np
+from pydicom.filereader import dcmread
+
+from .slice import DicomSlice, SliceHeader, decode_slice, is_compressed
+
+
+class SeriesDecoder:
+    """Read slices on a thread pool and decode them on a process pool.
+
+    Worker processes are started with `start_method`, `forkserver` by
+    default: forking the threaded server could leave a child holding a
+    lock copied from another thread. A pool broken by a dying worker is
+    replaced, and the slices it was decoding are retried once.
+    """
+
+    # Slices read or decoding at a time per worker, which bounds the
+    # compressed bytes held for the process pool.
+    in_flight = 2
+
+    def __init__(
+        self,
+        read_workers: int = 8,
+        decode_workers: int | None = None,
+        processes: bool = True,
+        start_method: str = "forkserver",
+    ):
+        self.read_workers = read_workers
+        self.decode_workers = decode_workers or os.cpu_count() or 1
+        self.processes = processes
+        self.start_method = start_method
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.processes:
+                    context = multiprocessing.get_context(self.start_method)
+                    if self.start_method == "forkserver":
+                        # Children fork from a server that imported the
+                        # decoder once, not from the threaded server.
+                        context.set_forkserver_preload([__name__])
+                    self._pool = ProcessPoolExecutor(
+                        self.decode_workers, mp_context=context
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(self.decode_workers)
+            return self._pool
+
+    def _replace(self, pool: Executor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def _decode(self, data: bytes, retried: bool = False) -> tuple:
+        pool = self.pool
+        try:
+            return pool.submit(decode_slice, data), pool, retried
+        except BrokenProcessPool:
+            self._replace(pool)
+            if retried:
+                raise
+            return self._decode(data, retried=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _read(self, slice_record: DicomSlice) -> tuple[bytes | None, tuple]:
+        # Uncompressed frames are cheaper to decode in place than to ship
+        # to another process, only compressed ones go to the pool.
+        data = slice_record.read_bytes()
+        dataset = dcmread(io.BytesIO(data))
+        if self.processes and is_compressed(dataset):
+            return data, ()
+        return None, decode_slice(dataset)
+
+    def read_headers(
+        self, slices: list[DicomSlice]
+    ) -> list[SliceHeader | None]:
+        with ThreadPoolExecutor(self.read_workers) as readers:
+            return list(readers.map(DicomSlice.read_header, slices))
+
+    def frames(
+        self, slices: list[DicomSlice]
+    ) -> Generator[tuple[int, np.ndarray | None], None, None]:
+        """Yield `(index, frame)` pairs in completion order."""
+        limit = self.in_flight * (self.read_workers + self.decode_workers)
+        queued = iter(enumerate(slices))
+        with ThreadPoolExecutor(self.read_workers) as readers:
+            reads: dict[Future, int] = {}
+            decodes: dict[Future, tuple[int, bytes, Executor, bool]] = {}
+            while True:
+                for index, slice_record in islice(
+                    queued, limit - len(reads) - len(decodes)
+                ):
+                    reads[readers.submit(self._read, slice_record)] = index
+                if not reads and not decodes:
+                    return
+                done, _ = wait([*reads, *decodes], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in reads:
+                        index = reads.pop(future)
+                        data, result = future.result()
+                        if data is not None:
+                            decode, pool, retried = self._decode(data)
+                            decodes[decode] = index, data, pool, retried
+                            continue
+                    else:
+                        index, data, pool, retried = decodes.pop(future)
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            self._replace(pool)
+                            if retried:
+                                raise
+                            decode, pool, retried = self._decode(data, True)
+                            decodes[decode] = index, data, pool, retried
+                            continue
+                    frame, _ = result
+                    yield index, frame
@@ -0,0 +1,95 @@
+import fcntl
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+
+
+class DiskVolumeCache:
+    """Decoded series volumes stored as `.npy` files with a JSON sidecar.
+
+    Volumes are opened with `np.load(mmap_mode="r")`, so repeated reads
+    are served from the page cache without copies. Files are written to a
+    temporary name and renamed into place, and writes and evictions hold
+    an exclusive `flock`, so several worker processes can share one
+    directory. The least recently used volumes are evicted once the
+    directory grows past `max_bytes`.
+    """
+
+    def __init__(self, root: Path | str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.root / f"{key}.npy", self.root / f"{key}.json"
+
+    @contextmanager
+    def _locked(self) -> Generator[None, None, None]:
+        with open(self.root / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key: str) -> tuple[np.ndarray, np.ndarray] | None:
+        volume_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+            volume = np.load(volume_path, mmap_mode="r")
+            os.utime(volume_path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return volume, np.array(meta["spacing"])
+
+    def put(self, key: str, volume: np.ndarray, spacing: np.ndarray) -> None:
+        """Store `volume` with its per-slice `spacing` rows.
+
+        The sidecar keeps the spacing rows in volume order, the third
+        column being the slice location that defines the ordering.
+        """
+        volume_path, meta_path = self._paths(key)
+        meta = {
+            "shape": list(volume.shape),
+            "dtype": str(volume.dtype),
+            "spacing": np.asarray(spacing).tolist(),
+        }
+        with self._locked():
+            self._write(meta_path, lambda f: f.write(json.dumps(meta)), "w")
+            self._write(volume_path, lambda f: np.save(f, volume), "wb")
+            self._evict()
+
+    def _write(self, path: Path, dump, mode: str) -> None:
+        fd, temp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode) as temp_file:
+                dump(temp_file)
+            os.replace(temp_name, path)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+    def _evict(self) -> None:
+        volumes = []
+        for volume_path in self.root.glob("*.npy"):
+            try:
+                stat = volume_path.stat()
+            except FileNotFoundError:
+                continue
+            volumes.append((stat.st_mtime, stat.st_size, volume_path))
+        total = sum(size for _, size, _ in volumes)
+        for _, size, volume_path in sorted(volumes):
+            if total <= self.max_bytes:
+                break
+            # Readers that already mapped the file keep their mapping.
+            volume_path.unlink(missing_ok=True)
+            volume_path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,28 @@
+import hashlib
+from typing import Generator
+
+from pydicom.dataset import FileDataset
+
+DIGEST_SIZE = 16
+
+
+def _uids(dicom: FileDataset) -> Generator[str, None, None]:
+    for patient in dicom.patient_records:
+        for study in patient.children:
+            yield study.get("StudyInstanceUID", "")
+            for series in study.children:
+                yield series.get("SeriesInstanceUID", "")
+
+
+def fingerprint(dicom: FileDataset, data: bytes | memoryview) -> str:
+    """Hash the study and series UIDs followed by the raw DICOMDIR bytes.
+
+    Only study and series records are visited, image records are covered
+    by the raw bytes, so the cost is a single pass of blake2b over the file.
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for uid in _uids(dicom):
+        digest.update(str(uid).encode())
+        digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
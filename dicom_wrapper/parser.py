@@ -1,4 +1,5 @@
 import hashlib
+import io
 from pathlib import Path
 from typing import Any, Iterable
 
@@ -32,6 +33,10 @@ class DicomParser:
             self.slice_path = _get_shortest_path(path.iterdir(), path)
         self.path = path
 
-    def read(self) -> FileDataset:
-        with dcmread(read_file(self.path), force=True) as dicom:
+    def read_bytes(self) -> bytes:
+        return read_file(self.path).read()
+
+    def read(self, data: bytes | None = None) -> FileDataset:
+        source = read_file(self.path) if data is None else io.BytesIO(data)
+        with dcmread(source, force=True) as dicom:
             return dicom
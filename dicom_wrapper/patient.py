@@ -1,24 +1,40 @@
+from functools import cached_property
 from typing import Generator
 
 from pydicom.dataset import Dataset
 
+from .cache import VolumeCache
 from .parser import PT, make_hash
 from .series import DicomSeries, Series
 from .study import DicomStudy
 
 
 class DicomPatient:
-    def __init__(self, record: Dataset, path: PT, slice_path: PT):
+    def __init__(
+        self,
+        record: Dataset,
+        path: PT,
+        slice_path: PT,
+        cache: VolumeCache | None = None,
+    ):
         self.record = record
         self.name = str(record.PatientName)
-        self.studies = [
-            DicomStudy(record, path, slice_path)
-            for record in self.record.children
-        ]
+        self.path = path
+        self.slice_path = slice_path
+        self.cache = cache
 
     def __str__(self) -> str:
         return self.name
 
+    @cached_property
+    def studies(self) -> list[DicomStudy]:
+        return [
+            DicomStudy(
+                record, self.path, self.slice_path, self.cache, f"{self}_"
+            )
+            for record in self.record.children
+        ]
+
     @property
     def hash(self) -> str:
         return make_hash(self)
@@ -1,16 +1,29 @@
 from collections import namedtuple
+from functools import cached_property
 
 import numpy as np
 from pydicom.dataset import Dataset
 
+from .cache import VolumeCache
 from .parser import PT, make_hash
-from .slice import DicomSlice
+from .slice import DicomSlice, SliceHeader
+from .volume import VolumeBuilder
 
 Series = namedtuple("Series", ["name", "data"])
+SeriesIndex = namedtuple("SeriesIndex", ["name", "uid", "slices_num"])
 
 
 class DicomSeries:
-    def __init__(self, record: Dataset, path: PT, slice_path: PT):
+    builder = VolumeBuilder()
+
+    def __init__(
+        self,
+        record: Dataset,
+        path: PT,
+        slice_path: PT,
+        cache: VolumeCache | None = None,
+        prefix: str = "",
+    ):
         self.record = record
         self.description = (
             (str(record.SeriesDescription),)
@@ -18,14 +31,31 @@ class DicomSeries:
             else "No description"
         )
         self.number = str(record.SeriesNumber)
-        self.slices = [
-            DicomSlice(record, path, slice_path)
-            for record in self.record.children
-        ]
+        self.uid = str(record.get("SeriesInstanceUID", ""))
+        self.path = path
+        self.slice_path = slice_path
+        self.cache = cache
+        self.prefix = prefix
 
     def __str__(self) -> str:
         return f"{self.description}_{self.number}"
 
+    @property
+    def key(self) -> str:
+        """Hash of the full series name, as in `DicomCube.serieses_name`."""
+        return make_hash(f"{self.prefix}{self}")
+
+    @property
+    def slices_num(self) -> int:
+        return len(self.record.children)
+
+    @cached_property
+    def slices(self) -> list[DicomSlice]:
+        return [
+            DicomSlice(record, self.path, self.slice_path)
+            for record in self.record.children
+        ]
+
     @property
     def hash(self) -> str:
         return make_hash(self)
@@ -38,35 +68,47 @@ class DicomSeries:
     def old_name_mapping(self) -> tuple[str, str]:
         return self.description[0], str(self)
 
+    @cached_property
+    def slice_headers(self) -> list[tuple[DicomSlice, SliceHeader]]:
+        """Slices that have a location with their headers, in record order."""
+        headers = self.builder.decoder.read_headers(self.slices)
+        return [
+            (slice_record, header)
+            for slice_record, header in zip(self.slices, headers)
+            if header is not None
+        ]
+
+    @property
+    def headers(self) -> list[SliceHeader]:
+        return [header for _, header in self.slice_headers]
+
+    @property
+    def spacing_data(self) -> np.ndarray:
+        return np.array([header.spacing for header in self.headers])
+
+    def _decode(self) -> tuple[np.ndarray | list, np.ndarray | list]:
+        volume, spacing = self.builder.build(self.slice_headers)
+        if len(volume):
+            volume.flags.writeable = False
+        return volume, spacing
+
+    @property
+    def volume(self) -> tuple[np.ndarray | list, np.ndarray | list]:
+        """Sorted decoded frames and their spacings, decoded once per cache."""
+        if self.cache is None:
+            return self._decode()
+        return self.cache.get(self.key, self._decode)
+
     @property
     def series(self) -> Series:
-        data = [slice_record.read_all() for slice_record in self.slices]
-        frames = [
-            (frame, spacing)
-            for frame, spacing in data
-            if (frame is not None) and (spacing is not None)
-        ]
-        sorted_frames = sorted(frames, key=lambda x: x[1][2])
-        data_frames = [frame[0] for frame in sorted_frames]
-        if len(data_frames):
-            data = np.stack(data_frames)
-        else:
-            data = []
+        data, _ = self.volume
         return Series(
             name=str(self),
             data=data,
         )
 
     @property
-    def series_spacing_data(self) -> Series:
-        data = [slice_record.read_all() for slice_record in self.slices]
-        frames, spacing = zip(
-            *[(frame, spacing) for frame, spacing in data if frame is not None]
-        )
-        if len(frames) and len(spacing):
-            frames_array = np.stack(frames)
-            spacing_array = np.array(spacing)
-        else:
-            frames_array = []
-            spacing_array = []
-        return frames_array, spacing_array
+    def series_spacing_data(
+        self,
+    ) -> tuple[np.ndarray | list, np.ndarray | list]:
+        return self.volume
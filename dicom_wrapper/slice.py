@@ -1,27 +1,98 @@
+import io
+from collections import namedtuple
+from functools import cached_property
+
 import numpy as np
-from pydicom.dataset import Dataset
+from pydicom.dataset import Dataset, FileDataset
 from pydicom.filereader import dcmread
+from pydicom.pixel_data_handlers.util import pixel_dtype
 
-from minio_path.utils import read_file
+from minio_path.utils import open_file, read_file
 
 from .parser import PT
 
+HEADER_TAGS = [
+    "PixelSpacing",
+    "SliceLocation",
+    "Rows",
+    "Columns",
+    "SamplesPerPixel",
+    "BitsAllocated",
+    "PixelRepresentation",
+]
+
+SliceHeader = namedtuple("SliceHeader", ["spacing", "shape", "dtype"])
+
+
+def _header_dtype(slice_record: FileDataset) -> np.dtype | None:
+    try:
+        return pixel_dtype(slice_record)
+    except (AttributeError, NotImplementedError, ValueError):
+        return None
+
+
+def is_compressed(slice_record: FileDataset) -> bool:
+    file_meta = getattr(slice_record, "file_meta", None)
+    transfer_syntax = getattr(file_meta, "TransferSyntaxUID", None)
+    return transfer_syntax is not None and transfer_syntax.is_compressed
+
+
+def decode_slice(
+    data: bytes | FileDataset,
+) -> tuple[np.ndarray, tuple[float, float, float]] | tuple[None, None]:
+    if isinstance(data, FileDataset):
+        slice_record = data
+    else:
+        slice_record = dcmread(io.BytesIO(data))
+    if hasattr(slice_record, "SliceLocation"):
+        return slice_record.pixel_array, (
+            float(slice_record.PixelSpacing[0]),
+            float(slice_record.PixelSpacing[1]),
+            float(slice_record.SliceLocation),
+        )
+    return None, None
+
 
 class DicomSlice:
     def __init__(self, record: Dataset, path: PT, slice_path: PT):
         self.record = record
         self.path = path
-        self.slice_path = slice_path.joinpath(*record.ReferencedFileID[1:])
+        self.root_path = slice_path
+
+    @cached_property
+    def slice_path(self) -> PT:
+        return self.root_path.joinpath(*self.record.ReferencedFileID[1:])
+
+    def read_bytes(self) -> bytes:
+        with read_file(self.slice_path) as slice_file:
+            return slice_file.read()
 
     def read_all(self) -> None | tuple[np.ndarray, tuple[float, float, float]]:
-        slice_record = dcmread(read_file(self.slice_path))
+        return decode_slice(self.read_bytes())
+
+    def read_header(self) -> None | SliceHeader:
+        with open_file(self.slice_path) as slice_file:
+            slice_record = dcmread(
+                slice_file,
+                stop_before_pixels=True,
+                specific_tags=HEADER_TAGS,
+            )
         if hasattr(slice_record, "SliceLocation"):
-            return slice_record.pixel_array, (
-                slice_record.PixelSpacing[0],
-                slice_record.PixelSpacing[1],
-                slice_record.SliceLocation,
+            return SliceHeader(
+                spacing=(
+                    slice_record.PixelSpacing[0],
+                    slice_record.PixelSpacing[1],
+                    slice_record.SliceLocation,
+                ),
+                shape=(slice_record.Rows, slice_record.Columns)
+                + (
+                    (slice_record.SamplesPerPixel,)
+                    if slice_record.get("SamplesPerPixel", 1) > 1
+                    else ()
+                ),
+                dtype=_header_dtype(slice_record),
             )
-        return None, None
+        return None
 
     def read(self) -> None | np.ndarray:
         slice_record = dcmread(read_file(self.slice_path))
@@ -15,11 +15,16 @@ def compute_spacing(data: Any, *args, **kwargs) -> Spacing:
 
 @compute_spacing.register
 def _compute_from_raw_spacings(data: np.ndarray) -> Spacing:
+    if not len(data):
+        raise ValueError("no slice spacings to compute the spacing from")
     spacing_x, spacing_y, spcing_z = (
         np.unique(data[:, 0]),
         np.unique(data[:, 1]),
         np.unique(np.diff(data[:, 2], axis=0).round(3), axis=0),
     )
+    if not len(spcing_z):
+        # A single slice has no neighbour to measure the distance to.
+        spcing_z = np.array([compute_spacing(None)[2]])
     if (
         spacing_x.shape[0] != 1
         and spacing_y.shape[0] != 1
@@ -34,8 +39,7 @@ def _compute_from_raw_spacings(data: np.ndarray) -> Spacing:
 @compute_spacing.register
 def _compute_from_dicom_cube(series_name: str, cube: DicomCube) -> Spacing:
     serieses = dict(cube.serieses_name)
-    _, spacing = serieses[series_name].series_spacing_data
-    return compute_spacing(spacing)
+    return compute_spacing(serieses[series_name].spacing_data)
 
 
 @compute_spacing.register
@@ -43,6 +47,6 @@ def _compute_all_from_dicom_cube(
     cube: DicomCube,
 ) -> dict[str, Spacing]:
     return {
-        name: compute_spacing(series.series_spacing_data[1])
+        name: compute_spacing(series.spacing_data)
         for name, series in cube.serieses_name
     }
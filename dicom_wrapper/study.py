@@ -1,25 +1,47 @@
+from functools import cached_property
 from typing import Generator
 
 from pydicom.dataset import Dataset
 
+from .cache import VolumeCache
 from .parser import PT, make_hash
 from .series import DicomSeries, Series
 
 
 class DicomStudy:
-    def __init__(self, record: Dataset, path: PT, slice_path: PT):
+    def __init__(
+        self,
+        record: Dataset,
+        path: PT,
+        slice_path: PT,
+        cache: VolumeCache | None = None,
+        prefix: str = "",
+    ):
         self.record = record
         self.description = str(record.StudyDescription)
         self.date = str(record.StudyDate)
         self.time = str(record.StudyTime)
-        self._serieses = [
-            DicomSeries(record, path, slice_path)
-            for record in self.record.children
-        ]
+        self.path = path
+        self.slice_path = slice_path
+        self.cache = cache
+        self.prefix = prefix
 
     def __str__(self) -> str:
         return f"{self.description}_{self.date}_{self.time}"
 
+    @cached_property
+    def _serieses(self) -> list[DicomSeries]:
+        return [
+            DicomSeries(
+                record,
+                self.path,
+                self.slice_path,
+                self.cache,
+                f"{self.prefix}{self}_",
+            )
+            for record in self.record.children
+        ]
+
     @property
     def hash(self) -> str:
         return make_hash(self)
@@ -47,4 +69,5 @@ class DicomStudy:
     @property
     def serieses(self) -> Generator[Series, None, None]:
         for series in self._serieses:
-            yield Series(f"{self}_{series.series.name}", series.series.data)
+            name, data = series.series
+            yield Series(f"{self}_{name}", data)
@@ -1,8 +1,12 @@
+from minio_path import MinioPath
+
 from .cube import DicomCube
 from .parser import PT, DicomParser
 
 
 def dicom_find(path: PT):
+    if isinstance(path, MinioPath) and path.tree is None:
+        path = path.scan()
     for sub_path in path.iterdir():
         if sub_path.name == "DICOMDIR":
             yield DicomCube(DicomParser(sub_path))
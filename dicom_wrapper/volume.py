@@ -0,0 +1,59 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .decode import SeriesDecoder
+from .slice import DicomSlice, SliceHeader
+
+
+class VolumeBuilder:
+    """Assemble a series into one array sized from its slice headers.
+
+    Headers give the slice count, frame shape, dtype and location order,
+    so the volume is allocated once, either in memory or as an anonymous
+    `np.memmap` under `memmap_dir`, and every decoded frame is copied
+    straight into its sorted position.
+    """
+
+    def __init__(
+        self,
+        decoder: SeriesDecoder | None = None,
+        memmap_dir: Path | str | None = None,
+    ):
+        self.decoder = SeriesDecoder() if decoder is None else decoder
+        self.memmap_dir = memmap_dir
+
+    def allocate(self, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        if self.memmap_dir is None:
+            return np.empty(shape, dtype=dtype)
+        # The file is unlinked right away, the mapping keeps it alive for
+        # as long as the array is referenced.
+        with tempfile.TemporaryFile(dir=self.memmap_dir) as buffer:
+            return np.memmap(buffer, dtype=dtype, mode="w+", shape=shape)
+
+    def build(
+        self, slice_headers: list[tuple[DicomSlice, SliceHeader]]
+    ) -> tuple[np.ndarray | list, np.ndarray | list]:
+        if not len(slice_headers):
+            return [], []
+        ordered = sorted(slice_headers, key=lambda x: x[1].spacing[2])
+        slices = [slice_record for slice_record, _ in ordered]
+        headers = [header for _, header in ordered]
+        shape = (len(headers), *headers[0].shape)
+        volume = None
+        if headers[0].dtype is not None:
+            volume = self.allocate(shape, headers[0].dtype)
+        for index, frame in self.decoder.frames(slices):
+            if frame is None:
+                raise ValueError(f"{slices[index].slice_path} has no frame")
+            if frame.shape != shape[1:]:
+                raise ValueError(
+                    f"{slices[index].slice_path} frame shape {frame.shape} "
+                    f"differs from the series shape {shape[1:]}"
+                )
+            if volume is None:
+                volume = self.allocate(shape, frame.dtype)
+            volume[index] = frame
+        spacing = np.array([header.spacing for header in headers])
+        return volume, spacing
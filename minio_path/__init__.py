@@ -1,5 +1,23 @@
 # from . import utils
+from .aio import AsyncMinioPath
+from .client import MinioClients
 from .config import MinioConfig
+from .manifest import Manifest
+from .multipart import MultipartWriter
 from .path import MinioPath
+from .stat_cache import StatCache
+from .stream import MinioReader
+from .tree import ObjectInfo, PrefixTree
 
-__all__ = ["MinioConfig", "MinioPath"]
+__all__ = [
+    "AsyncMinioPath",
+    "Manifest",
+    "MinioClients",
+    "MinioConfig",
+    "MinioPath",
+    "MinioReader",
+    "MultipartWriter",
+    "ObjectInfo",
+    "PrefixTree",
+    "StatCache",
+]
@@ -0,0 +1,121 @@
+import io
+from functools import partial
+from typing import Any, AsyncGenerator, BinaryIO, Callable, Iterable, Self
+
+import anyio
+from anyio.lowlevel import RunVar
+
+from .config import MinioConfig
+from .path import MinioPath
+from .tree import ObjectInfo
+
+DEFAULT_MAX_THREADS = 32
+
+_limiter: RunVar[anyio.CapacityLimiter] = RunVar("minio_path_limiter")
+
+
+class AsyncMinioPath:
+    """Awaitable facade over `MinioPath` for use inside an event loop.
+
+    Blocking calls run in worker threads on the pooled client of the
+    wrapped path. They are bounded by a limiter of their own, so slow
+    object storage cannot exhaust the threadpool that serves the other
+    endpoints.
+    """
+
+    max_threads = DEFAULT_MAX_THREADS
+
+    def __init__(self, path: MinioPath):
+        self.path = path
+
+    @classmethod
+    def fromconfig(cls, config: MinioConfig) -> Self:
+        return cls(MinioPath.fromconfig(config))
+
+    @classmethod
+    def limiter(cls) -> anyio.CapacityLimiter:
+        try:
+            return _limiter.get()
+        except LookupError:
+            limiter = anyio.CapacityLimiter(cls.max_threads)
+            _limiter.set(limiter)
+            return limiter
+
+    @classmethod
+    async def run_sync(cls, func: Callable[..., Any], *args: Any) -> Any:
+        return await anyio.to_thread.run_sync(
+            partial(func, *args), limiter=cls.limiter()
+        )
+
+    @property
+    def bucket(self) -> str | None:
+        return self.path.bucket
+
+    @property
+    def objectname(self) -> str | None:
+        return self.path.objectname
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def __truediv__(self, path: str) -> Self:
+        return type(self)(self.path / path)
+
+    def joinpath(self, *paths: str) -> Self:
+        return type(self)(self.path.joinpath(*paths))
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def __repr__(self) -> str:
+        return repr(self.path)
+
+    def __eq__(self, other: Self) -> bool:
+        return self.path == other.path
+
+    def is_dir(self) -> bool:
+        return self.path.is_dir()
+
+    async def scan(self) -> Self:
+        return type(self)(await self.run_sync(self.path.scan))
+
+    async def iterdir(self) -> AsyncGenerator[Self, None]:
+        for path in await self.run_sync(lambda: list(self.path.iterdir())):
+            yield type(self)(path)
+
+    async def rglob(self, pattern: str = "*") -> AsyncGenerator[Self, None]:
+        paths = await self.run_sync(lambda: list(self.path.rglob(pattern)))
+        for path in paths:
+            yield type(self)(path)
+
+    async def exists(self) -> bool:
+        return await self.run_sync(self.path.exists)
+
+    async def stat(self) -> ObjectInfo:
+        return await self.run_sync(self.path.stat)
+
+    async def read_range(self, offset: int = 0, length: int = 0) -> bytes:
+        return await self.run_sync(self.path.read_range, offset, length)
+
+    async def read(self) -> io.BytesIO:
+        return await self.run_sync(self.path.read)
+
+    async def write(self, open_file: BinaryIO, length: int) -> None:
+        await self.run_sync(self.path.write, open_file, length)
+
+    @classmethod
+    async def exists_many(cls, paths: Iterable[Self]) -> list[bool]:
+        return await cls.run_sync(
+            MinioPath.exists_many, [path.path for path in paths]
+        )
+
+    @classmethod
+    async def write_many(
+        cls, objects: Iterable[tuple[Self, BinaryIO, int]]
+    ) -> list[Self]:
+        written = await cls.run_sync(
+            MinioPath.write_many,
+            ((path.path, stream, length) for path, stream, length in objects),
+        )
+        return [cls(path) for path in written]
@@ -0,0 +1,63 @@
+import os
+import socket
+import threading
+
+import certifi
+import urllib3
+from minio import Minio
+from urllib3.connection import HTTPConnection
+
+from .config import MinioConfig
+
+
+def make_http_client(config: MinioConfig) -> urllib3.PoolManager:
+    socket_options = list(HTTPConnection.default_socket_options)
+    if config.keep_alive:
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    return urllib3.PoolManager(
+        maxsize=config.pool_size,
+        timeout=urllib3.util.Timeout(
+            connect=config.connect_timeout, read=config.read_timeout
+        ),
+        cert_reqs="CERT_REQUIRED" if config.cert_check else "CERT_NONE",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(
+            total=config.retries,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        socket_options=socket_options,
+    )
+
+
+class MinioClients:
+    """Process-wide registry holding one pooled `Minio` client per config.
+
+    Every path built from the same config shares the client and with it
+    the urllib3 connection pool, so connections are reused across
+    requests and threads.
+    """
+
+    _clients: dict[str, Minio] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, config: MinioConfig) -> Minio:
+        key = config.json()
+        with cls._lock:
+            if key not in cls._clients:
+                cls._clients[key] = Minio(
+                    config.host,
+                    access_key=config.access_key,
+                    secret_key=config.secret_key,
+                    session_token=config.session_token,
+                    secure=config.secure,
+                    region=config.region,
+                    http_client=make_http_client(config),
+                )
+            return cls._clients[key]
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._clients.clear()
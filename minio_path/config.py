@@ -8,3 +8,16 @@ class MinioConfig(BaseModel):
     access_key: str
     secret_key: str
     secure: bool = False
+    session_token: str | None = None
+    region: str | None = None
+    cert_check: bool = True
+    pool_size: int = 32
+    keep_alive: bool = True
+    connect_timeout: float = 10
+    read_timeout: float = 300
+    retries: int = 5
+
+    class Config:
+        # Clients are shared per config, a setting it does not hold
+        # could not be applied to them.
+        extra = "forbid"
@@ -0,0 +1,80 @@
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self
+
+from minio import S3Error
+
+from .path import MinioPath
+
+
+class Manifest:
+    """Digests of the objects stored under `root`, keyed by relative name.
+
+    The manifest lives next to the objects it describes, so a repeated
+    upload of the same content can skip every object whose digest is
+    already recorded and which is still present in the bucket.
+    """
+
+    filename = "MANIFEST.json"
+    stat_workers = 16
+
+    def __init__(self, root: MinioPath, digests: dict[str, str] | None = None):
+        self.root = root
+        self.digests = {} if digests is None else digests
+        self.changed = False
+
+    @property
+    def path(self) -> MinioPath:
+        return self.root / self.filename
+
+    @staticmethod
+    def digest(data: bytes | memoryview) -> str:
+        return hashlib.md5(data).hexdigest()
+
+    @classmethod
+    def load(cls, root: MinioPath) -> Self:
+        manifest = cls(root)
+        try:
+            digests = json.load(manifest.path.read())
+        except S3Error:
+            return manifest
+        # Only the recorded objects are checked, `root` may hold others.
+        with ThreadPoolExecutor(cls.stat_workers) as executor:
+            stored = executor.map(
+                lambda name: root.joinpath(*name.split("/")).exists(),
+                digests,
+            )
+            manifest.digests = {
+                name: digest
+                for (name, digest), exists in zip(digests.items(), stored)
+                if exists
+            }
+        manifest.changed = len(manifest.digests) != len(digests)
+        return manifest
+
+    def relative(self, path: MinioPath) -> str | None:
+        root = str(self.root).rstrip(MinioPath.sep) + MinioPath.sep
+        name = str(path)
+        if not name.startswith(root):
+            return None
+        return name[len(root) :].lstrip(MinioPath.sep)
+
+    def update(self, path: MinioPath, digest: str) -> bool:
+        """Record `digest` for `path`, return whether it has to be written."""
+        name = self.relative(path)
+        if name is None:
+            return True
+        if self.digests.get(name) == digest:
+            return False
+        self.digests[name] = digest
+        self.changed = True
+        return True
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+        data = json.dumps(self.digests, indent=1, sort_keys=True).encode()
+        self.path.write(io.BytesIO(data), len(data))
+        self.changed = False
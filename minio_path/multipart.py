@@ -0,0 +1,195 @@
+import io
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from minio.datatypes import Part
+from minio.error import MinioException
+from minio.helpers import MIN_PART_SIZE
+from urllib3.exceptions import HTTPError
+
+from .tree import ObjectInfo
+
+if TYPE_CHECKING:
+    from .path import MinioPath
+
+DEFAULT_PART_SIZE = 16 * 1024**2
+DEFAULT_PART_WORKERS = 4
+
+
+class MultipartWriter(io.RawIOBase):
+    """Writable object stream uploaded in concurrent multipart parts.
+
+    Written bytes are copied once into part-sized buffers taken from a
+    pool of `2 * workers` buffers, full parts are uploaded by `workers`
+    threads and `write` blocks while every buffer is in flight, so memory
+    stays bounded for data of any length. Failed parts are retried on
+    their own, a failure that persists, an exception inside the `with`
+    block or dropping a writer that was never closed aborts the upload.
+    Objects smaller than one part are sent with a single `put_object`.
+    """
+
+    def __init__(
+        self,
+        path: "MinioPath",
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = DEFAULT_PART_WORKERS,
+        retries: int = 3,
+    ):
+        self.path = path
+        self.part_size = part_size
+        self.workers = workers
+        self.retries = retries
+        self.length = 0
+        self._pool: queue.SimpleQueue[bytearray] = queue.SimpleQueue()
+        self._allocated = 0
+        self._pool_lock = threading.Lock()
+        self._buffer: bytearray | None = None
+        self._filled = 0
+        self._upload_id: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._parts: list[Future] = []
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part size must be at least {MIN_PART_SIZE}")
+
+    @property
+    def name(self) -> str:
+        return str(self.path)
+
+    def writable(self) -> bool:
+        return True
+
+    def _take_buffer(self) -> bytearray:
+        with self._pool_lock:
+            try:
+                return self._pool.get_nowait()
+            except queue.Empty:
+                if self._allocated < 2 * self.workers:
+                    self._allocated += 1
+                    return bytearray(self.part_size)
+        return self._pool.get()
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        if self.closed:
+            raise ValueError("write to closed file")
+        view = memoryview(data).cast("B")
+        written = 0
+        while written < len(view):
+            if self._buffer is None:
+                self._buffer = self._take_buffer()
+                self._filled = 0
+            size = min(len(view) - written, self.part_size - self._filled)
+            self._buffer[self._filled : self._filled + size] = view[
+                written : written + size
+            ]
+            self._filled += size
+            written += size
+            if self._filled == self.part_size:
+                self._submit_part()
+        self.length += written
+        return written
+
+    def _submit_part(self) -> None:
+        for part in self._parts:
+            if part.done() and part.exception() is not None:
+                raise part.exception()
+        if self._upload_id is None:
+            self._upload_id = self.path.minio._create_multipart_upload(
+                self.path.bucket, self.path.objectname, {}
+            )
+            self._executor = ThreadPoolExecutor(self.workers)
+        self._parts.append(
+            self._executor.submit(
+                self._upload_part,
+                len(self._parts) + 1,
+                self._buffer,
+                self._filled,
+            )
+        )
+        self._buffer = None
+        self._filled = 0
+
+    def _upload_part(
+        self, part_number: int, buffer: bytearray, size: int
+    ) -> Part:
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    etag = self.path.minio._upload_part(
+                        self.path.bucket,
+                        self.path.objectname,
+                        memoryview(buffer)[:size],
+                        None,
+                        self._upload_id,
+                        part_number,
+                    )
+                    return Part(part_number, etag)
+                except (MinioException, HTTPError):
+                    if attempt == self.retries:
+                        raise
+                    time.sleep(self.path.retry_backoff * 2**attempt)
+        finally:
+            self._pool.put(buffer)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                data = b"" if self._buffer is None else self._buffer
+                result = self.path.minio.put_object(
+                    self.path.bucket,
+                    self.path.objectname,
+                    io.BytesIO(memoryview(data)[: self._filled]),
+                    self._filled,
+                )
+            else:
+                if self._filled:
+                    self._submit_part()
+                result = self.path.minio._complete_multipart_upload(
+                    self.path.bucket,
+                    self.path.objectname,
+                    self._upload_id,
+                    [part.result() for part in self._parts],
+                )
+        except BaseException:
+            self.abort()
+            raise
+        self._release()
+        self.path._record(ObjectInfo(self.length, result.etag, None))
+        super().close()
+
+    def abort(self) -> None:
+        """Drop the written data and every uploaded part."""
+        if self.closed:
+            return
+        for part in self._parts:
+            part.cancel()
+        wait(self._parts)
+        self._release()
+        if self._upload_id is not None:
+            self.path.minio._abort_multipart_upload(
+                self.path.bucket, self.path.objectname, self._upload_id
+            )
+        super().close()
+
+    def _release(self) -> None:
+        if self._executor is not None:
+            # Every part is settled by now. Not joining the workers lets a
+            # writer whose last reference drops in a worker be finalized.
+            self._executor.shutdown(wait=False)
+        self._buffer = None
+
+    def __del__(self) -> None:
+        # `IOBase.__del__` closes, which would complete an unfinished
+        # upload with whatever was buffered.
+        if not self.closed:
+            self.abort()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
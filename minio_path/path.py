@@ -1,18 +1,42 @@
+import fnmatch
 import io
-from typing import Generator, Self
+import posixpath
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Generator, Iterable, Self
 
 from minio import Minio, S3Error
+from minio.error import MinioException
+from urllib3.exceptions import HTTPError
 
+from .client import MinioClients
 from .config import MinioConfig
+from .multipart import DEFAULT_PART_SIZE, DEFAULT_PART_WORKERS, MultipartWriter
+from .stat_cache import StatCache
+from .stream import open_reader
+from .tree import ObjectInfo, PrefixTree, dir_key
 
 
 class MinioPath:
     sep = "/"
+    write_workers = 8
+    write_retries = 3
+    retry_backoff = 0.2
+    part_size = DEFAULT_PART_SIZE
+    part_workers = DEFAULT_PART_WORKERS
 
-    def __init__(self, minio: Minio, path="", parent: Self | None = None):
+    def __init__(
+        self,
+        minio: Minio,
+        path="",
+        parent: Self | None = None,
+        tree: PrefixTree | None = None,
+    ):
         self.minio = minio
         self._path = path
         self.parent = parent
+        self.tree = tree
 
     @property
     def path(self) -> str:
@@ -54,13 +78,19 @@ class MinioPath:
     def fromauth(
         cls, host: str, access_key: str, secret_key: str, **kwargs
     ) -> Self:
-        return MinioPath(
-            Minio(host, access_key=access_key, secret_key=secret_key, **kwargs)
+        return cls.fromconfig(
+            MinioConfig(
+                host=host,
+                access_key=access_key,
+                secret_key=secret_key,
+                **kwargs,
+            )
         )
 
     @classmethod
     def fromconfig(cls, config: MinioConfig) -> Self:
-        return cls.fromauth(**config.dict())
+        """Path bound to the shared client registered for `config`."""
+        return cls(MinioClients.get(config))
 
     @classmethod
     def frompath(cls, current_path: Self, new_path: str) -> Self:
@@ -68,6 +98,7 @@ class MinioPath:
             minio=current_path.minio,
             path=current_path.path,
             parent=current_path,
+            tree=current_path.tree,
         )
         new_minio_path.parent.path = cls.sep
         new_minio_path.path = new_path
@@ -97,34 +128,238 @@ class MinioPath:
     def __neq__(self, other: Self) -> bool:
         return self._path != other._path
 
+    def _indexed(self) -> bool:
+        return self.tree is not None and self.tree.covers(
+            dir_key(self.objectname)
+        )
+
+    def scan(self) -> Self:
+        """Copy of this path bound to a snapshot of everything below it.
+
+        The snapshot comes from a single recursive listing, paths derived
+        from the copy answer `iterdir`, `walk`, `exists` and `stat` from
+        it without further requests.
+        """
+        return type(self)(
+            self.minio,
+            self.path,
+            self.parent,
+            PrefixTree.fromlisting(self.minio, self.bucket, self.objectname),
+        )
+
     def iterdir(self) -> Generator[Self, None, None]:
+        if self._indexed():
+            for entry in self.tree.children(self.objectname):
+                yield self / entry
+            return
         for minio_object in self.minio.list_objects(
             self.bucket, prefix=self.objectname
         ):
-            yield self / minio_object._object_name[len(self.objectname) :]
+            yield self / minio_object.object_name[len(self.objectname) :]
+
+    def walk(self) -> Generator[tuple[Self, list[str], list[str]], None, None]:
+        """Top-down `(dirpath, dirnames, filenames)` like `os.walk`."""
+        stack = [self if self._indexed() else self.scan()]
+        while stack:
+            current = stack.pop()
+            entries = current.tree.children(current.objectname)
+            dirnames = [
+                entry.rstrip(self.sep)
+                for entry in entries
+                if entry.endswith(self.sep)
+            ]
+            filenames = [
+                entry for entry in entries if not entry.endswith(self.sep)
+            ]
+            yield current, dirnames, filenames
+            stack.extend(
+                current / f"{dirname}{self.sep}"
+                for dirname in reversed(dirnames)
+            )
+
+    def rglob(self, pattern: str = "*") -> Generator[Self, None, None]:
+        for dirpath, _, filenames in self.walk():
+            for filename in fnmatch.filter(filenames, pattern):
+                yield dirpath / filename
 
     def is_dir(self) -> bool:
         """Get whether this key is a directory."""
         return self.objectname.endswith("/")
 
-    def exists(self) -> bool:
+    @property
+    def stat_cache(self) -> StatCache:
+        return StatCache.of(self.minio)
+
+    def _stat(self) -> ObjectInfo | None:
+        if self._indexed():
+            return self.tree.stat(self.objectname)
+        hit, info = self.stat_cache.lookup(self.bucket, self.objectname)
+        if hit:
+            return info
         try:
             result = self.minio.stat_object(self.bucket, self.objectname)
-            return result is not None
+            info = ObjectInfo(result.size, result.etag, result.last_modified)
         except S3Error:
-            return False
+            info = None
+        self.stat_cache.store(self.bucket, self.objectname, info)
+        return info
+
+    def stat(self) -> ObjectInfo:
+        info = self._stat()
+        if info is None:
+            raise FileNotFoundError(str(self))
+        return info
+
+    def exists(self) -> bool:
+        return self._stat() is not None
+
+    @classmethod
+    def exists_many(cls, paths: Iterable[Self]) -> list[bool]:
+        """Answer `exists` for every path with one listing per bucket.
+
+        Paths with a fresh cached answer are not listed again, the others
+        are resolved from a single recursive listing below their common
+        prefix and the results are cached.
+        """
+        paths = list(paths)
+        missing: dict[tuple[Minio, str], list[Self]] = {}
+        for path in paths:
+            if path._indexed():
+                continue
+            hit, _ = path.stat_cache.lookup(path.bucket, path.objectname)
+            if not hit:
+                missing.setdefault((path.minio, path.bucket), []).append(path)
+        for (minio, bucket), group in missing.items():
+            names = {path.objectname for path in group}
+            prefix = posixpath.commonprefix(list(names))
+            prefix = prefix[: prefix.rfind(cls.sep) + 1]
+            cache = StatCache.of(minio)
+            for minio_object in minio.list_objects(
+                bucket, prefix=prefix, recursive=True
+            ):
+                if minio_object.object_name in names:
+                    names.discard(minio_object.object_name)
+                    cache.store(
+                        bucket,
+                        minio_object.object_name,
+                        ObjectInfo(
+                            minio_object.size,
+                            minio_object.etag,
+                            minio_object.last_modified,
+                        ),
+                    )
+            for name in names:
+                cache.store(bucket, name, None)
+        return [path.exists() for path in paths]
+
+    def read_range(self, offset: int = 0, length: int = 0) -> bytes:
+        """Read `length` bytes from `offset`, to the end if `length` is 0."""
+        response = self.minio.get_object(
+            self.bucket, self.objectname, offset=offset, length=length
+        )
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def read_into(self, buffer: memoryview, offset: int = 0) -> int:
+        """Fill `buffer` with object bytes from `offset`, return the count."""
+        response = self.minio.get_object(
+            self.bucket, self.objectname, offset=offset, length=len(buffer)
+        )
+        try:
+            filled = 0
+            while filled < len(buffer):
+                read = response.readinto(buffer[filled:])
+                if not read:
+                    break
+                filled += read
+            return filled
+        finally:
+            response.close()
+            response.release_conn()
 
     def read(self) -> io.BytesIO:
-        response = self.minio.get_object(self.bucket, self.objectname)
-        return io.BytesIO(response.read())
+        return io.BytesIO(self.read_range())
+
+    def _record(self, info: ObjectInfo) -> None:
+        self.stat_cache.store(self.bucket, self.objectname, info)
+        if self._indexed():
+            self.tree.add(self.objectname, info)
 
     def write(self, open_file: io.BytesIO, length: int):
-        self.minio.put_object(
+        if length > self.part_size:
+            # Exactly `length` bytes as `put_object` uploads, a short
+            # stream aborts the upload.
+            with self.open("wb") as writer:
+                remaining = length
+                while remaining:
+                    data = open_file.read(min(self.part_size, remaining))
+                    if not data:
+                        raise OSError(
+                            f"stream ended after {length - remaining} "
+                            f"of {length} bytes"
+                        )
+                    writer.write(data)
+                    remaining -= len(data)
+            return
+        result = self.minio.put_object(
             self.bucket,
             self.objectname,
             open_file,
             length,
         )
+        self._record(ObjectInfo(length, result.etag, None))
+
+    @classmethod
+    def write_many(
+        cls,
+        objects: Iterable[tuple[Self, BinaryIO, int]],
+        workers: int | None = None,
+        retries: int | None = None,
+    ) -> list[Self]:
+        """Upload `(path, stream, length)` triples concurrently.
+
+        At most `2 * workers` streams are taken from `objects` ahead of the
+        uploads, so lazy sources are consumed with backpressure. Failed
+        uploads are retried after rewinding the stream. Every stream is
+        closed once its upload is finished.
+        """
+        workers = workers or cls.write_workers
+        retries = cls.write_retries if retries is None else retries
+        slots = threading.BoundedSemaphore(2 * workers)
+
+        def _write(path: Self, stream: BinaryIO, length: int) -> Self:
+            try:
+                for attempt in range(retries + 1):
+                    try:
+                        path.write(stream, length)
+                        return path
+                    except (MinioException, HTTPError):
+                        if attempt == retries:
+                            raise
+                        stream.seek(0)
+                        time.sleep(cls.retry_backoff * 2**attempt)
+            finally:
+                stream.close()
+                slots.release()
+
+        with ThreadPoolExecutor(workers) as executor:
+            futures = []
+            for path, stream, length in objects:
+                slots.acquire()
+                futures.append(executor.submit(_write, path, stream, length))
+            return [future.result() for future in futures]
 
-    def open(self, mode="r") -> Self:
+    def open(self, mode="r") -> Self | io.BufferedReader | MultipartWriter:
+        if mode == "rb":
+            return open_reader(self)
+        if mode == "wb":
+            return MultipartWriter(
+                self,
+                part_size=self.part_size,
+                workers=self.part_workers,
+                retries=self.write_retries,
+            )
         return self
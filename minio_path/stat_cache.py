@@ -0,0 +1,74 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Self
+
+from minio import Minio
+
+from .tree import ObjectInfo
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class StatCache:
+    """Object metadata looked up through one `Minio` client, with a TTL.
+
+    Misses are cached as `None`, so asking again whether an artifact
+    exists costs nothing until the entry expires. Writes through
+    `MinioPath` store the new metadata directly. The oldest entries are
+    dropped once `max_entries` is reached.
+    """
+
+    _caches: "weakref.WeakKeyDictionary[Minio, StatCache]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _caches_lock = threading.Lock()
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[float, ObjectInfo | None]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, minio: Minio) -> Self:
+        with cls._caches_lock:
+            if minio not in cls._caches:
+                cls._caches[minio] = cls()
+            return cls._caches[minio]
+
+    def lookup(self, bucket: str, name: str) -> tuple[bool, ObjectInfo | None]:
+        """Return `(hit, info)`, `info` is `None` for a cached miss."""
+        with self._lock:
+            entry = self._entries.get((bucket, name))
+            if entry is None:
+                return False, None
+            expires, info = entry
+            if expires < time.monotonic():
+                del self._entries[(bucket, name)]
+                return False, None
+            return True, info
+
+    def store(self, bucket: str, name: str, info: ObjectInfo | None) -> None:
+        with self._lock:
+            self._entries[(bucket, name)] = (time.monotonic() + self.ttl, info)
+            self._entries.move_to_end((bucket, name))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, bucket: str, name: str) -> None:
+        with self._lock:
+            self._entries.pop((bucket, name), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
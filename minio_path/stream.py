@@ -0,0 +1,91 @@
+import io
+from typing import TYPE_CHECKING
+
+from minio import S3Error
+
+if TYPE_CHECKING:
+    from .path import MinioPath
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class MinioReader(io.RawIOBase):
+    """Seekable read-only object stream backed by HTTP range requests.
+
+    Each `readinto` fetches exactly the requested span, so wrapping it in
+    `io.BufferedReader` downloads an object chunk by chunk and a reader
+    that stops early, like pydicom with `stop_before_pixels`, only pays for
+    the chunks it touched. Responses are always drained and released, so
+    the pooled connections are reused.
+    """
+
+    def __init__(self, path: "MinioPath", size: int | None = None):
+        self.path = path
+        self._size = size
+        self._position = 0
+
+    @property
+    def name(self) -> str:
+        return str(self.path)
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = self.path.minio.stat_object(
+                self.path.bucket, self.path.objectname
+            ).size
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        view = memoryview(buffer).cast("B")
+        if not len(view) or (
+            self._size is not None and self._position >= self._size
+        ):
+            return 0
+        try:
+            read = self.path.read_into(view, self._position)
+        except S3Error as error:
+            if error.code == "InvalidRange":
+                return 0
+            raise
+        self._position += read
+        return read
+
+    def readall(self) -> bytes:
+        try:
+            data = self.path.read_range(self._position)
+        except S3Error as error:
+            if error.code == "InvalidRange":
+                return b""
+            raise
+        self._position += len(data)
+        return data
+
+
+def open_reader(
+    path: "MinioPath", buffer_size: int = DEFAULT_CHUNK_SIZE
+) -> io.BufferedReader:
+    return io.BufferedReader(MinioReader(path), buffer_size=buffer_size)
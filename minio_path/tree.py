@@ -0,0 +1,65 @@
+from collections import namedtuple
+from typing import Self
+
+from minio import Minio
+
+ObjectInfo = namedtuple("ObjectInfo", ["size", "etag", "last_modified"])
+
+SEP = "/"
+
+
+def dir_key(name: str) -> str:
+    if name and not name.endswith(SEP):
+        return f"{name}{SEP}"
+    return name
+
+
+class PrefixTree:
+    """Snapshot of every object under `prefix` from one recursive listing.
+
+    Directories map to their entry names in listing order, a trailing
+    separator marks sub-directories as in a non-recursive listing. Objects
+    keep their size, etag and modification time.
+    """
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = dir_key(prefix)
+        self.objects: dict[str, ObjectInfo] = {}
+        self.dirs: dict[str, dict[str, None]] = {self.prefix: {}}
+
+    @classmethod
+    def fromlisting(cls, minio: Minio, bucket: str, prefix: str = "") -> Self:
+        tree = cls(prefix)
+        for minio_object in minio.list_objects(
+            bucket, prefix=tree.prefix, recursive=True
+        ):
+            tree.add(
+                minio_object.object_name,
+                ObjectInfo(
+                    minio_object.size,
+                    minio_object.etag,
+                    minio_object.last_modified,
+                ),
+            )
+        return tree
+
+    def covers(self, name: str) -> bool:
+        return name.startswith(self.prefix)
+
+    def add(self, name: str, info: ObjectInfo) -> None:
+        self.objects[name] = info
+        *dirs, filename = name[len(self.prefix) :].split(SEP)
+        parent = self.prefix
+        for dirname in dirs:
+            entry = f"{dirname}{SEP}"
+            self.dirs.setdefault(parent, {})[entry] = None
+            parent = f"{parent}{entry}"
+            self.dirs.setdefault(parent, {})
+        if filename:
+            self.dirs.setdefault(parent, {})[filename] = None
+
+    def stat(self, name: str) -> ObjectInfo | None:
+        return self.objects.get(name)
+
+    def children(self, name: str) -> list[str]:
+        return list(self.dirs.get(dir_key(name), ()))
@@ -1,6 +1,7 @@
 from ._condirtional_import import import_if_install as __import_if_install
+from .archive import unzip
 from .pickle import pickle_dump, pickle_load
-from .read import read_file, recursive_read_files
+from .read import open_file, read_file, recursive_read_files
 
 if __import_if_install("numpy"):
     from ._np import numpy_dump, numpy_load
@@ -8,6 +9,7 @@ if __import_if_install("torch"):
     from ._t import torch_dump, torch_load
 
 __all__ = [
+    "open_file",
     "pickle_dump",
     "pickle_load",
     "read_file",
@@ -16,4 +18,5 @@ __all__ = [
     "numpy_load",
     "torch_dump",
     "torch_load",
+    "unzip",
 ]
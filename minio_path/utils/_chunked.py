@@ -0,0 +1,160 @@
+import io
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Callable
+
+import numpy as np
+
+CHUNKED_SUFFIX = ".npc"
+MAGIC = b"NPCHUNK1"
+FOOTER = struct.Struct("<Q8s")
+DEFAULT_CHUNK_BYTES = 1024**2
+COMPRESSION_LEVEL = 1
+HEAD_BYTES = 4 * 1024
+TAIL_BYTES = 16 * 1024
+
+ReadRange = Callable[[int, int], bytes]
+
+
+def _shuffle(chunk: np.ndarray) -> bytes:
+    data = np.ascontiguousarray(chunk).view(np.uint8)
+    if chunk.dtype.itemsize == 1:
+        return data.tobytes()
+    return data.reshape(-1, chunk.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype) -> np.ndarray:
+    raw = np.frombuffer(data, np.uint8)
+    if dtype.itemsize > 1:
+        raw = raw.reshape(dtype.itemsize, -1).T
+    return np.ascontiguousarray(raw).view(dtype).ravel()
+
+
+def dump_chunked(
+    file: BinaryIO, array: np.ndarray, chunk_rows: int | None = None
+) -> None:
+    """Write `array` as zlib compressed, byte shuffled chunks of rows.
+
+    Chunks split the first axis and are followed by a JSON index with
+    their compressed sizes and a fixed size footer, so a reader locates
+    any row from the end of the object with range requests.
+    """
+    array = np.asarray(array)
+    if array.ndim == 0 or array.dtype.hasobject:
+        raise ValueError("chunked arrays need an axis and no object fields")
+    row_bytes = max(1, array[:1].nbytes)
+    chunk_rows = chunk_rows or max(1, DEFAULT_CHUNK_BYTES // row_bytes)
+    sizes = []
+    for start in range(0, array.shape[0], chunk_rows):
+        chunk = array[start : start + chunk_rows]
+        data = zlib.compress(_shuffle(chunk), COMPRESSION_LEVEL)
+        file.write(data)
+        sizes.append(len(data))
+    index = json.dumps(
+        {
+            "shape": array.shape,
+            "dtype": np.lib.format.dtype_to_descr(array.dtype),
+            "chunk_rows": chunk_rows,
+            "codec": "zlib",
+            "shuffle": True,
+            "sizes": sizes,
+        }
+    ).encode()
+    file.write(index)
+    file.write(FOOTER.pack(len(index), MAGIC))
+
+
+def _select_rows(index: Any, rows: int) -> tuple[range, Any]:
+    """Rows to fetch for `index` and the index to apply to them."""
+    if isinstance(index, tuple) and index:
+        first, rest = index[0], index[1:]
+    else:
+        first, rest = index, ()
+    if isinstance(first, (int, np.integer)):
+        row = range(rows)[first]
+        return range(row, row + 1), (0, *rest)
+    if isinstance(first, slice):
+        selected = range(rows)[first]
+        if not selected:
+            return range(0), (slice(0, 0), *rest)
+        low = min(selected[0], selected[-1])
+        stop = selected.stop - low
+        relative = slice(
+            selected.start - low, stop if stop >= 0 else None, selected.step
+        )
+        return range(low, max(selected[0], selected[-1]) + 1), (
+            relative,
+            *rest,
+        )
+    return range(rows), index
+
+
+def load_chunked(read_range: ReadRange, size: int, index: Any = None) -> Any:
+    """Read `array[index]` fetching only the chunks holding its rows."""
+    tail_length = min(size, TAIL_BYTES)
+    tail = read_range(size - tail_length, tail_length)
+    index_length, magic = FOOTER.unpack(tail[-FOOTER.size :])
+    if magic != MAGIC:
+        raise ValueError("not a chunked array")
+    if index_length + FOOTER.size > tail_length:
+        tail = read_range(
+            size - FOOTER.size - index_length, index_length + FOOTER.size
+        )
+    meta = json.loads(tail[-FOOTER.size - index_length : -FOOTER.size])
+    shape = tuple(meta["shape"])
+    dtype = np.lib.format.descr_to_dtype(
+        meta["dtype"]
+        if isinstance(meta["dtype"], str)
+        else [tuple(field) for field in meta["dtype"]]
+    )
+    chunk_rows = meta["chunk_rows"]
+    offsets = np.concatenate([[0], np.cumsum(meta["sizes"], dtype=np.int64)])
+
+    rows, rest = _select_rows(index, shape[0])
+    out = np.empty((len(rows), *shape[1:]), dtype)
+    if len(rows):
+        # Chunks are stored back to back, the ones covering the selected
+        # rows are fetched with a single range request.
+        first = rows.start // chunk_rows
+        last = (rows.stop - 1) // chunk_rows
+        base = int(offsets[first])
+        data = memoryview(read_range(base, int(offsets[last + 1]) - base))
+        for chunk_id in range(first, last + 1):
+            start = chunk_id * chunk_rows
+            stop = min(start + chunk_rows, shape[0])
+            compressed = data[
+                offsets[chunk_id] - base : offsets[chunk_id + 1] - base
+            ]
+            chunk = _unshuffle(zlib.decompress(compressed), dtype).reshape(
+                (stop - start, *shape[1:])
+            )
+            low, high = max(start, rows.start), min(stop, rows.stop)
+            out[low - rows.start : high - rows.start] = chunk[
+                low - start : high - start
+            ]
+    return out if rest is None else out[rest]
+
+
+def load_npy(read_range: ReadRange, size: int, index: Any) -> np.ndarray:
+    """Read `array[index]` from a `.npy` object fetching only its rows."""
+    head = io.BytesIO(read_range(0, min(size, HEAD_BYTES)))
+    version = np.lib.format.read_magic(head)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(head)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(head)
+    if fortran_order or dtype.hasobject or not shape:
+        return np.load(io.BytesIO(read_range(0, size)))[index]
+    rows, rest = _select_rows(index, shape[0])
+    row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+    if not len(rows) or not row_bytes:
+        out = np.empty((len(rows), *shape[1:]), dtype)
+    else:
+        data = read_range(
+            head.tell() + rows.start * row_bytes, len(rows) * row_bytes
+        )
+        out = np.frombuffer(bytearray(data), dtype).reshape(
+            (len(rows), *shape[1:])
+        )
+    return out if rest is None else out[rest]
@@ -1,44 +1,111 @@
-import io
 from functools import singledispatch
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import numpy as np
 
+from minio_path.aio import AsyncMinioPath
 from minio_path.path import MinioPath
 
+from ._chunked import CHUNKED_SUFFIX, dump_chunked, load_chunked, load_npy
+
+
+def _local_range(path: Path):
+    def read_range(offset: int, length: int) -> bytes:
+        with path.open("rb") as local_file:
+            local_file.seek(offset)
+            return local_file.read(length)
+
+    return read_range
+
+
+def _byte_view(array: np.ndarray) -> memoryview:
+    return memoryview(array.reshape(-1).view(np.uint8))
+
+
+def _write_npy(file: BinaryIO, array: np.ndarray) -> None:
+    # `np.save` serializes contiguous arrays with `tobytes()` unless it
+    # writes to a real file, the buffer is passed on as is here instead.
+    array = np.asanyarray(array)
+    if array.dtype.hasobject:
+        np.save(file, array)
+        return
+    header = np.lib.format.header_data_from_array_1_0(array)
+    try:
+        np.lib.format.write_array_header_1_0(file, header)
+    except ValueError:
+        np.lib.format.write_array_header_2_0(file, header)
+    if array.flags.c_contiguous:
+        file.write(_byte_view(array))
+    elif header["fortran_order"]:
+        file.write(_byte_view(array.T))
+    else:
+        # Strided views are copied a bounded block of rows at a time.
+        row_bytes = max(array[:1].nbytes, 1)
+        rows = max(16 * 1024**2 // row_bytes, 1)
+        for start in range(0, array.shape[0], rows):
+            block = np.ascontiguousarray(array[start : start + rows])
+            file.write(_byte_view(block))
+
 
 @singledispatch
-def numpy_dump(path: Any, array: np.ndarray) -> None:
-    ...
+def numpy_dump(
+    path: Any, array: np.ndarray, chunk_rows: int | None = None
+) -> None:
+    """Store `array` as `.npy`, or as compressed row chunks for `.npc`."""
 
 
 @numpy_dump.register
-def _numpy_dump_s3(path: MinioPath, array: np.ndarray) -> None:
+def _numpy_dump_s3(
+    path: MinioPath, array: np.ndarray, chunk_rows: int | None = None
+) -> None:
     if path.exists():
         return
-    buffer = io.BytesIO()
-    np.save(buffer, array)
-    path.write(io.BytesIO(buffer.getvalue()), buffer.tell())
+    with path.open("wb") as writer:
+        if path.name.endswith(CHUNKED_SUFFIX):
+            dump_chunked(writer, array, chunk_rows)
+        else:
+            _write_npy(writer, array)
 
 
 @numpy_dump.register
-def _numpy_dump_local(path: Path, array: np.ndarray) -> None:
+def _numpy_dump_local(
+    path: Path, array: np.ndarray, chunk_rows: int | None = None
+) -> None:
     if path.exists():
         return
+    if path.name.endswith(CHUNKED_SUFFIX):
+        with path.open("wb") as local_file:
+            dump_chunked(local_file, array, chunk_rows)
+        return
     np.save(path, array)
 
 
 @singledispatch
-def numpy_load(path: Any) -> Any:
-    ...
+def numpy_load(path: Any, index: Any = None) -> Any:
+    """Load `array[index]`, reading only the rows the index selects."""
+
+
+@numpy_load.register
+def _numpy_load_s3(path: MinioPath, index: Any = None) -> np.ndarray:
+    if path.name.endswith(CHUNKED_SUFFIX):
+        return load_chunked(path.read_range, path.stat().size, index)
+    if index is None:
+        return np.load(path.read())
+    return load_npy(path.read_range, path.stat().size, index)
 
 
 @numpy_load.register
-def _numpy_load_s3(path: MinioPath) -> np.ndarray:
-    return np.load(path.read())
+async def _numpy_load_async(
+    path: AsyncMinioPath, index: Any = None
+) -> np.ndarray:
+    return await AsyncMinioPath.run_sync(numpy_load, path.path, index)
 
 
 @numpy_load.register
-def _numpy_load_local(path: Path) -> np.ndarray:
-    return np.load(path)
+def _numpy_load_local(path: Path, index: Any = None) -> np.ndarray:
+    if path.name.endswith(CHUNKED_SUFFIX):
+        return load_chunked(_local_range(path), path.stat().st_size, index)
+    if index is None:
+        return np.load(path)
+    return np.array(np.load(path, mmap_mode="r")[index])
@@ -5,6 +5,7 @@ from typing import Any
 
 import torch as t
 
+from minio_path.aio import AsyncMinioPath
 from minio_path.path import MinioPath
 
 
@@ -18,6 +19,11 @@ def _torch_load_s3(path: MinioPath) -> Any:
     return t.load(path.read())
 
 
+@torch_load.register
+async def _torch_load_async(path: AsyncMinioPath) -> Any:
+    return t.load(await path.read())
+
+
 @torch_load.register(str)
 @torch_load.register(Path)
 def _torch_load_local(path: Path) -> Any:
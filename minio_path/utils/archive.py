@@ -0,0 +1,75 @@
+import shutil
+import zipfile
+from functools import singledispatch
+from pathlib import Path
+from typing import Any, Generator
+
+from minio_path.manifest import Manifest
+from minio_path.path import MinioPath
+
+
+@singledispatch
+def unzip(
+    path: Any,
+    archive: zipfile.ZipFile,
+    manifest: Manifest | None = None,
+    prefix: str = "",
+) -> Generator[Any, None, None]:
+    """Extract the members under `prefix` to `path`, without the prefix."""
+    yield from ()
+
+
+def _members(
+    archive: zipfile.ZipFile, prefix: str
+) -> Generator[tuple[list[str], zipfile.ZipInfo], None, None]:
+    for info in archive.infolist():
+        if info.filename.startswith(prefix) and not info.is_dir():
+            yield info.filename[len(prefix) :].split("/"), info
+
+
+def _zip_digest(info: zipfile.ZipInfo) -> str:
+    return f"crc32:{info.CRC:08x}:{info.file_size}"
+
+
+@unzip.register
+def _unzip_s3(
+    path: MinioPath,
+    archive: zipfile.ZipFile,
+    manifest: Manifest | None = None,
+    prefix: str = "",
+) -> Generator[MinioPath, None, None]:
+    # Each member is decompressed exactly once while it is streamed into
+    # the bucket, its length is taken from the zip central directory.
+    # With a manifest, members whose CRC and size are already recorded
+    # are not written again.
+    members = [
+        (path.joinpath(*parts), info)
+        for parts, info in _members(archive, prefix)
+    ]
+    MinioPath.write_many(
+        (member_path, archive.open(info), info.file_size)
+        for member_path, info in members
+        if manifest is None or manifest.update(member_path, _zip_digest(info))
+    )
+    if manifest is not None:
+        manifest.save()
+    yield from (member_path for member_path, _ in members)
+
+
+@unzip.register
+def _unzip_local(
+    path: Path,
+    archive: zipfile.ZipFile,
+    manifest: Manifest | None = None,
+    prefix: str = "",
+) -> Generator[Path, None, None]:
+    if not prefix:
+        for info in archive.infolist():
+            yield Path(archive.extract(info, path))
+        return
+    for parts, info in _members(archive, prefix):
+        member_path = path.joinpath(*parts)
+        member_path.parent.mkdir(parents=True, exist_ok=True)
+        with archive.open(info) as source, member_path.open("wb") as target:
+            shutil.copyfileobj(source, target)
+        yield member_path
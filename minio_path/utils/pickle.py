@@ -1,9 +1,9 @@
-import io
 import pickle
 from functools import singledispatch
 from pathlib import Path
 from typing import Any
 
+from minio_path.aio import AsyncMinioPath
 from minio_path.path import MinioPath
 
 
@@ -16,9 +16,8 @@ def pickle_dump(path: Any, obj: Any) -> None:
 def _dump_s3(path: MinioPath, obj: Any) -> None:
     if path.exists():
         return
-    buffer = io.BytesIO()
-    pickle.dump(obj, buffer)
-    path.write(io.BytesIO(buffer.getvalue()), buffer.tell())
+    with path.open("wb") as writer:
+        pickle.dump(obj, writer, protocol=5)
 
 
 @pickle_dump.register
@@ -38,6 +37,11 @@ def _load_s3(path: MinioPath) -> Any:
     return pickle.load(path.read())
 
 
+@pickle_load.register
+async def _load_async(path: AsyncMinioPath) -> Any:
+    return pickle.load(await path.read())
+
+
 @pickle_load.register
 def _load_local(path: Path) -> Any:
     return pickle.load(path)
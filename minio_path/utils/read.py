@@ -1,7 +1,7 @@
 import io
 from functools import singledispatch
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, BinaryIO, Generator
 
 from minio_path.path import MinioPath
 
@@ -9,6 +9,8 @@ from minio_path.path import MinioPath
 def recursive_read_files(
     path: MinioPath | Path,
 ) -> Generator[tuple[MinioPath | Path, io.BytesIO], None, None]:
+    if isinstance(path, MinioPath) and path.tree is None:
+        path = path.scan()
     for subpath in path.iterdir():
         if subpath.is_dir() and subpath != path:
             yield from recursive_read_files(subpath)
@@ -16,6 +18,21 @@ def recursive_read_files(
             yield subpath, read_file(subpath)
 
 
+@singledispatch
+def open_file(path: Any) -> BinaryIO:
+    return io.BytesIO(b"")
+
+
+@open_file.register
+def _s3_open(path: MinioPath) -> BinaryIO:
+    return path.open("rb")
+
+
+@open_file.register
+def _local_open(path: Path) -> BinaryIO:
+    return path.open("rb")
+
+
 @singledispatch
 def read_file(path: Any) -> io.BytesIO:
     return io.BytesIO("")